@@ -0,0 +1,88 @@
+"""
+Measure `import pipedrive` time and Client construction cost.
+
+Each measurement runs twice: once as the package works now (lazy) and once
+reproducing the eager baseline, where importing the package also imported
+aiohttp and all resource modules, and every Client built all resource objects.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--number N]
+"""
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESOURCE_MODULES = [
+    "activities", "deals", "filters", "leads", "items", "notes", "organizations", "persons",
+    "pipelines", "products", "stages", "recents", "subscriptions", "users", "webhooks",
+]
+
+LAZY_IMPORT = "import pipedrive"
+EAGER_IMPORT = "import aiohttp, pipedrive; " + "; ".join(
+    "import pipedrive.{}".format(module) for module in RESOURCE_MODULES
+)
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); {}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def bench_import(statement, runs):
+    """Time ``statement`` in fresh interpreters so module caches don't hide the cost."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET.format(statement)], env=env)
+        samples.append(float(output))
+    return samples
+
+
+def bench_construct(number):
+    """Time Client construction: lazy, lazy plus one resource, and eager (every resource built)."""
+    sys.path.insert(0, ROOT)
+    from pipedrive import Client
+
+    resources = []
+    for name in RESOURCE_MODULES:
+        descriptor = Client.__dict__[name]
+        resources.append((name, getattr(importlib.import_module(descriptor.module), descriptor.class_name)))
+
+    def eager():
+        # What Client.__init__ did before resources became lazy descriptors
+        client = Client(api_token="token")
+        for name, resource_class in resources:
+            client.__dict__[name] = resource_class(client)
+        return client
+
+    construct = timeit.timeit(lambda: Client(api_token="token"), number=number) / number
+    construct_and_use = timeit.timeit(lambda: Client(api_token="token").deals, number=number) / number
+    construct_eager = timeit.timeit(eager, number=number) / number
+    return construct, construct_and_use, construct_eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20, help="number of fresh-interpreter import runs")
+    parser.add_argument("--number", type=int, default=100000, help="number of Client constructions")
+    args = parser.parse_args()
+
+    lazy = statistics.median(bench_import(LAZY_IMPORT, args.runs))
+    eager = statistics.median(bench_import(EAGER_IMPORT, args.runs))
+    print("import pipedrive:       {:.2f} ms (eager baseline {:.2f} ms, {:.1f}x faster)".format(
+        lazy * 1000, eager * 1000, eager / lazy))
+
+    construct, construct_and_use, construct_eager = bench_construct(args.number)
+    print("Client():               {:.2f} us (eager baseline {:.2f} us, {:.1f}x faster)".format(
+        construct * 1e6, construct_eager * 1e6, construct_eager / construct))
+    print("Client().deals:         {:.2f} us".format(construct_and_use * 1e6))
+
+
+if __name__ == "__main__":
+    main()
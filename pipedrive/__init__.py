@@ -1,19 +1,44 @@
+import importlib
+
 from pipedrive.client import Client
-from pipedrive.activities import Activities
-from pipedrive.deals import Deals
-from pipedrive.filters import Filters
-from pipedrive.leads import Leads
-from pipedrive.items import Items
-from pipedrive.notes import Notes
-from pipedrive.organizations import Organizations
-from pipedrive.persons import Persons
-from pipedrive.pipelines import Pipelines
-from pipedrive.products import Products
-from pipedrive.stages import Stages
-from pipedrive.recents import Recents
-from pipedrive.subscriptions import Subscriptions
-from pipedrive.users import Users
-from pipedrive.webhooks import Webhooks
+
+# Resource classes and helpers are imported on first access (PEP 562) to keep
+# `import pipedrive` cheap for short-lived processes.
+_LAZY_ATTRIBUTES = {
+    'Activities': 'pipedrive.activities',
+    'Deals': 'pipedrive.deals',
+    'Filters': 'pipedrive.filters',
+    'Leads': 'pipedrive.leads',
+    'Items': 'pipedrive.items',
+    'Notes': 'pipedrive.notes',
+    'Organizations': 'pipedrive.organizations',
+    'Persons': 'pipedrive.persons',
+    'Pipelines': 'pipedrive.pipelines',
+    'Products': 'pipedrive.products',
+    'Stages': 'pipedrive.stages',
+    'Recents': 'pipedrive.recents',
+    'Subscriptions': 'pipedrive.subscriptions',
+    'Users': 'pipedrive.users',
+    'Webhooks': 'pipedrive.webhooks',
+    'PriorityScheduler': 'pipedrive.scheduler',
+    'Transport': 'pipedrive.transports',
+    'AiohttpTransport': 'pipedrive.transports',
+    'HttpxTransport': 'pipedrive.transports',
+    'BulkImporter': 'pipedrive.bulk_import',
+    'ImportJournal': 'pipedrive.bulk_import',
+    'DiffSync': 'pipedrive.diff_sync',
+    'PipelineAnalytics': 'pipedrive.analytics',
+    'FlowHistory': 'pipedrive.flow_history',
+    'FlowStore': 'pipedrive.flow_history',
+    'RecordingTransport': 'pipedrive.replay',
+    'ReplayTransport': 'pipedrive.replay',
+    'Tracer': 'pipedrive.tracing',
+    'InMemoryExporter': 'pipedrive.tracing',
+    'OpenTelemetryTracer': 'pipedrive.tracing',
+    'SubscriptionPaymentLoader': 'pipedrive.subscription_payments',
+    'SubscriptionCache': 'pipedrive.subscription_payments',
+    'ActivityWindow': 'pipedrive.activity_sync',
+}
 
 __all__ = [
     'Client',
@@ -31,5 +56,36 @@ __all__ = [
     'Recents',
     'Subscriptions',
     'Users',
-    'Webhooks'
-]
\ No newline at end of file
+    'Webhooks',
+    'PriorityScheduler',
+    'Transport',
+    'AiohttpTransport',
+    'HttpxTransport',
+    'BulkImporter',
+    'ImportJournal',
+    'DiffSync',
+    'PipelineAnalytics',
+    'FlowHistory',
+    'FlowStore',
+    'RecordingTransport',
+    'ReplayTransport',
+    'Tracer',
+    'InMemoryExporter',
+    'OpenTelemetryTracer',
+    'SubscriptionPaymentLoader',
+    'SubscriptionCache',
+    'ActivityWindow'
+]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError("module 'pipedrive' has no attribute '{}'".format(name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
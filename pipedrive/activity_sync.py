@@ -0,0 +1,267 @@
+import datetime
+from typing import Optional, Dict, Any, Iterable, List, Union
+
+from pipedrive import exceptions
+from pipedrive.batching import bounded_map, BatchResult
+from pipedrive.scheduler import BULK
+
+SHARD_SIZES = {
+    "day": datetime.timedelta(days=1),
+    "week": datetime.timedelta(weeks=1),
+}
+
+
+def _parse_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def _format_time(value: datetime.datetime) -> str:
+    return value.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def time_shards(start: datetime.datetime, end: datetime.datetime, size: datetime.timedelta):
+    """
+    Split the update time range [start, end) into consecutive shards.
+
+    The first shard has no lower bound and the last no upper bound (None), so
+    together the shards cover every possible update time.
+
+    Returns:
+        Iterator of (shard_start, shard_end) tuples with half-open bounds
+    """
+    if size <= datetime.timedelta(0):
+        raise ValueError("shard size must be positive")
+
+    boundaries = []
+    current = start
+    while current < end:
+        boundaries.append(current)
+        current += size
+    bounds = [None] + boundaries + [None]
+    return zip(bounds, bounds[1:])
+
+
+class ActivitySyncResult(BatchResult):
+    """Counters describing an activity window sync run."""
+
+    COUNTERS = ("shards", "fetched", "added", "updated", "removed", "failed")
+
+
+class ActivityWindow:
+    """
+    Local copy of every activity due in a date range for a set of users.
+
+    The v2 activities endpoint filters by owner and update time but not by due
+    date, so sync() splits each owner's update time range from ``history_start``
+    up to now into day/week shards and pages through the shards concurrently,
+    keeping the activities that are due in the window. Only activities left
+    untouched since before ``history_start`` come in one extra shard per owner.
+    Results are merged by activity id, keeping the most recently updated
+    version. refresh() then asks only for activities updated since the
+    previous sync, by owner and by the ids already in the window, and applies
+    them. Activities that were deleted, moved out of the window or reassigned
+    to another owner are dropped.
+
+    Example:
+        window = ActivityWindow(client, "2024-06-01", "2024-06-30", user_ids, shard="week")
+        await window.sync()
+        ...
+        await window.refresh()
+        calendar = window.for_user(user_id)
+    """
+
+    # Query parameter names of the v2 activities list endpoint
+    OWNER_PARAM = "owner_id"
+    UPDATED_SINCE_PARAM = "updated_since"
+    UPDATED_UNTIL_PARAM = "updated_until"
+    IDS_PARAM = "ids"
+
+    # Maximum number of ids the endpoint accepts per request
+    IDS_PER_REQUEST = 100
+
+    # Default update time range sharded by sync(), counted back from the window start or today
+    HISTORY = datetime.timedelta(days=90)
+
+    # Seconds subtracted from the refresh cut-off to absorb clock skew
+    REFRESH_OVERLAP = 60
+
+    def __init__(
+        self,
+        client,
+        start: Union[str, datetime.date],
+        end: Union[str, datetime.date],
+        user_ids: Iterable[Any],
+        shard: Union[str, datetime.timedelta] = "day",
+        history_start: Union[str, datetime.date, None] = None,
+        page_size: int = 100,
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        Initialize the window.
+
+        Args:
+            client: Client instance
+            start: First due date of the window (inclusive)
+            end: Last due date of the window (inclusive)
+            user_ids: Owners whose activities are synced
+            shard: Update time shard size, "day", "week" or a timedelta
+            history_start: Update date from which sync() shards (defaults to HISTORY before
+                the window start or today, whichever is earlier)
+            page_size: Number of activities per request
+            max_in_flight: Maximum number of shards fetched at once (defaults to concurrency_limit)
+        """
+        self.client = client
+        self.start = _parse_date(start)
+        self.end = _parse_date(end)
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        self.user_ids = list(user_ids)
+        self.shard_size = SHARD_SIZES[shard] if isinstance(shard, str) else shard
+        if history_start is None:
+            self.history_start = min(self.start, datetime.date.today()) - self.HISTORY
+        else:
+            self.history_start = _parse_date(history_start)
+        self.page_size = page_size
+        self.max_in_flight = max_in_flight or client.concurrency_limit
+
+        self.activities: Dict[Any, Dict[str, Any]] = {}
+        self.synced_at: Optional[datetime.datetime] = None
+
+    def _in_window(self, activity):
+        if activity.get("is_deleted"):
+            return False
+        due_date = activity.get("due_date")
+        if not due_date or not self.start <= _parse_date(due_date) <= self.end:
+            return False
+        return activity.get("owner_id") in self.user_ids
+
+    def _merge(self, activities, result):
+        """Apply fetched activities to the window, keeping the newest version of each."""
+        for activity in activities:
+            result.fetched += 1
+            activity_id = activity.get("id")
+            existing = self.activities.get(activity_id)
+
+            if not self._in_window(activity):
+                if existing is not None:
+                    del self.activities[activity_id]
+                    result.removed += 1
+                continue
+
+            if existing is None:
+                self.activities[activity_id] = activity
+                result.added += 1
+            elif (activity.get("update_time") or "") >= (existing.get("update_time") or ""):
+                if activity != existing:
+                    result.updated += 1
+                self.activities[activity_id] = activity
+
+    async def _fetch_shard(self, key, params, result, kwargs):
+        """Page through one shard by cursor and merge it once it is complete."""
+        activities = []
+        cursor = None
+        try:
+            while True:
+                page = dict(params, limit=self.page_size)
+                if cursor:
+                    page["cursor"] = cursor
+                response = await self.client.activities.get_all_activities(params=page, **kwargs)
+                activities.extend((response or {}).get("data") or [])
+
+                cursor = ((response or {}).get("additional_data") or {}).get("next_cursor")
+                if not cursor:
+                    break
+        except exceptions.ApiError as e:
+            result.failed += 1
+            result.errors[key] = e
+            return
+
+        self._merge(activities, result)
+
+    async def _run(self, shards, result, kwargs):
+        """Fetch shards concurrently; ``shards`` yields (shard key, query params)."""
+        def fetch(shard):
+            result.shards += 1
+            return self._fetch_shard(*shard, result, kwargs)
+
+        async for _ in bounded_map(fetch, shards, self.max_in_flight):
+            pass
+
+    async def sync(self, **kwargs) -> ActivitySyncResult:
+        """
+        Fetch the whole window, shard by shard.
+
+        Args:
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Returns:
+            ActivitySyncResult with shard and activity counts
+        """
+        kwargs.setdefault("priority", BULK)
+        started = datetime.datetime.now(datetime.timezone.utc)
+        history_start = datetime.datetime.combine(self.history_start, datetime.time(), datetime.timezone.utc)
+        result = ActivitySyncResult()
+
+        def shards():
+            for shard_start, shard_end in time_shards(history_start, started, self.shard_size):
+                for user_id in self.user_ids:
+                    params = {self.OWNER_PARAM: user_id}
+                    if shard_start is not None:
+                        params[self.UPDATED_SINCE_PARAM] = _format_time(shard_start)
+                    if shard_end is not None:
+                        params[self.UPDATED_UNTIL_PARAM] = _format_time(shard_end)
+                    yield (user_id, shard_start and shard_start.isoformat()), params
+
+        # A full sync replaces the window, so stale entries can't survive it
+        previous, self.activities = self.activities, {}
+        await self._run(shards(), result, kwargs)
+        if result.failed:
+            # Keep what we had for shards that could not be fetched
+            for activity_id, activity in previous.items():
+                self.activities.setdefault(activity_id, activity)
+        else:
+            self.synced_at = started
+        return result
+
+    async def refresh(self, **kwargs) -> ActivitySyncResult:
+        """
+        Apply activities changed since the last sync (falls back to sync() the first time).
+
+        Args:
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Returns:
+            ActivitySyncResult with activity counts
+        """
+        if self.synced_at is None:
+            return await self.sync(**kwargs)
+
+        kwargs.setdefault("priority", BULK)
+        started = datetime.datetime.now(datetime.timezone.utc)
+        since = _format_time(self.synced_at - datetime.timedelta(seconds=self.REFRESH_OVERLAP))
+        result = ActivitySyncResult()
+
+        # Activities reassigned to an owner outside user_ids are only returned when asked for by id
+        ids = [str(activity_id) for activity_id in self.activities]
+
+        def shards():
+            for user_id in self.user_ids:
+                yield (user_id, since), {self.OWNER_PARAM: user_id, self.UPDATED_SINCE_PARAM: since}
+            for offset in range(0, len(ids), self.IDS_PER_REQUEST):
+                chunk = ids[offset:offset + self.IDS_PER_REQUEST]
+                yield ("ids", offset), {self.IDS_PARAM: ",".join(chunk), self.UPDATED_SINCE_PARAM: since}
+
+        await self._run(shards(), result, kwargs)
+        if not result.failed:
+            self.synced_at = started
+        return result
+
+    def for_user(self, user_id) -> List[Dict[str, Any]]:
+        """Get a user's activities in the window, ordered by due date and time."""
+        activities = [activity for activity in self.activities.values() if activity.get("owner_id") == user_id]
+        activities.sort(key=lambda activity: (activity.get("due_date") or "", activity.get("due_time") or ""))
+        return activities
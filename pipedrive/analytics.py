@@ -0,0 +1,410 @@
+import datetime
+import importlib
+import time
+from typing import Optional, Dict, Any, Iterable, List
+
+# Flow entries that describe a deal moving between stages
+STAGE_FIELD_KEY = "stage_id"
+
+
+def _numpy():
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as e:
+        raise ImportError("pipedrive.analytics requires numpy: pip install numpy") from e
+
+
+def _to_utc_iso(value):
+    """Normalise a timestamp to a naive UTC ISO 8601 string that numpy can parse."""
+    if not value:
+        return "NaT"
+    # "YYYY-MM-DD HH:MM:SS" (UTC) is by far the most common form and numpy parses it as-is
+    if len(value) <= 19:
+        return value
+    if value[-1] == "Z":
+        return value[:-1]
+    tail = value[10:]
+    if "+" in tail or "-" in tail:
+        parsed = datetime.datetime.fromisoformat(value.replace(" ", "T"))
+        return parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None).isoformat()
+    return value
+
+
+def _to_epoch(np, values):
+    """Convert Pipedrive timestamps ("YYYY-MM-DD HH:MM:SS" or ISO 8601) to float epoch seconds, NaN if missing."""
+    cleaned = [_to_utc_iso(value) for value in values]
+    parsed = np.array(cleaned, dtype="datetime64[s]")
+    seconds = parsed.astype("int64").astype("float64")
+    seconds[np.isnat(parsed)] = np.nan
+    return seconds
+
+
+def _to_float(np, values):
+    return np.array([np.nan if value is None or value == "" else float(value) for value in values], dtype="float64")
+
+
+def _to_int(np, values, missing=-1):
+    return np.array([missing if value is None or value == "" else int(value) for value in values], dtype="int64")
+
+
+def _group_starts(np, sorted_keys):
+    """Indices where a new run of equal keys starts in a sorted array."""
+    if len(sorted_keys) == 0:
+        return np.zeros(0, dtype="int64")
+    return np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+
+
+def _later_max(np, sorted_keys, values):
+    """
+    For each element, the maximum of the values after it within its run of equal keys.
+
+    Elements that are last in their run get the minimum int64.
+    """
+    result = np.full(len(values), np.iinfo("int64").min, dtype="int64")
+    if len(values) == 0:
+        return result
+
+    # Running maximum over the reversed runs; offsetting each run keeps earlier runs from leaking in
+    keys = sorted_keys[::-1]
+    values = values[::-1].astype("int64")
+    run = np.cumsum(np.concatenate(([0], keys[1:] != keys[:-1])))
+    low = values.min()
+    span = int(values.max() - low) + 1
+    running = np.maximum.accumulate(run * span + (values - low)) - run * span + low
+
+    later = result.copy()
+    same_run = run[1:] == run[:-1]
+    later[1:][same_run] = running[:-1][same_run]
+    result[:] = later[::-1]
+    return result
+
+
+class PipelineAnalytics:
+    """
+    Column-oriented stage analytics over exported deals and their flow history.
+
+    Deals, stages and stage changes are converted to NumPy columns once; every
+    metric is then computed with vectorized array operations and memoized, so
+    repeated report calls on the same data are free.
+
+    Build it with ``from_records`` from already exported data or with the
+    ``load`` coroutine, which fetches a pipeline through the client.
+    """
+
+    def __init__(self, deals: Dict[str, Any], stages: Dict[str, Any], visits: Dict[str, Any], as_of: float):
+        """
+        Initialize from prepared columns; use from_records() or load() instead.
+
+        Args:
+            deals: Columns deal_id, stage_id, value, probability, status, close_time
+            stages: Columns stage_id, pipeline_id, order_nr, probability (sorted by stage_id)
+            visits: Columns deal_id, stage_id, entered_at, left_at, one row per stage entry
+            as_of: Epoch seconds used as the end of visits of open deals
+        """
+        self.deals = deals
+        self.stages = stages
+        self.visits = visits
+        self.as_of = as_of
+        self._cache = {}
+
+    @classmethod
+    def from_records(cls, deals: Iterable[Dict[str, Any]], flows: Dict[Any, List[Dict[str, Any]]],
+                     stages: Iterable[Dict[str, Any]], as_of: Optional[float] = None) -> "PipelineAnalytics":
+        """
+        Build the columns from API records.
+
+        Args:
+            deals: Deal objects (as returned by get_pipeline_deals/get_all_deals)
+            flows: Mapping of deal id to its flow entries (as returned by get_deal_updates)
+            stages: Stage objects (as returned by get_all_stages)
+            as_of: Epoch seconds treated as "now" for deals that are still open (defaults to now)
+
+        Returns:
+            PipelineAnalytics instance
+        """
+        np = _numpy()
+        if as_of is None:
+            as_of = time.time()
+
+        deals = list(deals)
+        stages = sorted(stages, key=lambda stage: stage["id"])
+
+        stage_columns = {
+            "stage_id": _to_int(np, [stage["id"] for stage in stages]),
+            "pipeline_id": _to_int(np, [stage.get("pipeline_id") for stage in stages]),
+            "order_nr": _to_int(np, [stage.get("order_nr") for stage in stages]),
+            "probability": _to_float(np, [stage.get("deal_probability") for stage in stages]),
+        }
+
+        status = np.array([deal.get("status") or "open" for deal in deals], dtype="U8")
+        deal_columns = {
+            "deal_id": _to_int(np, [deal["id"] for deal in deals]),
+            "stage_id": _to_int(np, [deal.get("stage_id") for deal in deals]),
+            "value": _to_float(np, [deal.get("value") or 0 for deal in deals]),
+            "probability": _to_float(np, [deal.get("probability") for deal in deals]),
+            "status": status,
+            "add_time": _to_epoch(np, [deal.get("add_time") for deal in deals]),
+            "close_time": _to_epoch(np, [deal.get("close_time") for deal in deals]),
+        }
+
+        # Flatten stage changes into columns
+        change_deal, change_time, change_old, change_new = [], [], [], []
+        for deal_id, entries in flows.items():
+            for entry in entries or []:
+                data = entry.get("data") or {}
+                if entry.get("object", "dealChange") != "dealChange" or data.get("field_key") != STAGE_FIELD_KEY:
+                    continue
+                change_deal.append(deal_id)
+                change_time.append(data.get("log_time") or entry.get("timestamp"))
+                change_old.append(data.get("old_value"))
+                change_new.append(data.get("new_value"))
+
+        changes = {
+            "deal_id": _to_int(np, change_deal),
+            "time": _to_epoch(np, change_time),
+            "old_stage": _to_int(np, change_old),
+            "new_stage": _to_int(np, change_new),
+        }
+        visits = cls._build_visits(np, deal_columns, changes, as_of)
+        return cls(deal_columns, stage_columns, visits, as_of)
+
+    @staticmethod
+    def _build_visits(np, deals, changes, as_of):
+        """Turn deals and stage changes into one row per stage entry with enter/leave times."""
+        deal_ids = deals["deal_id"]
+        deal_order = np.argsort(deal_ids)
+
+        # Ignore flows of deals that are not part of the export
+        known = np.isin(changes["deal_id"], deal_ids)
+        order = np.lexsort((changes["time"][known], changes["deal_id"][known]))
+        change_deal = changes["deal_id"][known][order]
+        change_time = changes["time"][known][order]
+        change_old = changes["old_stage"][known][order]
+        change_new = changes["new_stage"][known][order]
+
+        # The initial stage of a deal is the source of its first change, or its current stage
+        initial_stage = deals["stage_id"].copy()
+        first = _group_starts(np, change_deal)
+        if len(first):
+            positions = deal_order[np.searchsorted(deal_ids, change_deal[first], sorter=deal_order)]
+            initial_stage[positions] = change_old[first]
+
+        visit_deal = np.concatenate((deal_ids, change_deal))
+        visit_stage = np.concatenate((initial_stage, change_new))
+        visit_time = np.concatenate((deals["add_time"], change_time))
+
+        order = np.lexsort((visit_time, visit_deal))
+        visit_deal = visit_deal[order]
+        visit_stage = visit_stage[order]
+        visit_time = visit_time[order]
+
+        # A visit ends when the next one of the same deal starts; the last one at close time or as_of
+        left_at = np.empty_like(visit_time)
+        if len(visit_time):
+            left_at[:-1] = visit_time[1:]
+            last = np.ones(len(visit_time), dtype=bool)
+            last[:-1] = visit_deal[1:] != visit_deal[:-1]
+            positions = deal_order[np.searchsorted(deal_ids, visit_deal[last], sorter=deal_order)]
+            close_time = deals["close_time"][positions]
+            left_at[last] = np.where(np.isnan(close_time), as_of, close_time)
+
+        return {
+            "deal_id": visit_deal,
+            "stage_id": visit_stage,
+            "entered_at": visit_time,
+            "left_at": left_at,
+        }
+
+    def _memoize(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _stage_index(self, np, stage_ids):
+        """Map stage ids to positions in self.stages; -1 for unknown (e.g. deleted) stages."""
+        known_ids = self.stages["stage_id"]
+        index = np.searchsorted(known_ids, stage_ids)
+        index = np.clip(index, 0, max(len(known_ids) - 1, 0))
+        if len(known_ids) == 0:
+            return np.full(len(stage_ids), -1, dtype="int64")
+        return np.where(known_ids[index] == stage_ids, index, -1)
+
+    def stage_conversion(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Share of deals that moved on from each stage.
+
+        A deal that entered a stage counts as converted if it later reached a
+        stage with a higher order number or was won.
+
+        Returns:
+            Mapping of stage id to {"entered", "converted", "rate"}
+        """
+        return self._memoize("stage_conversion", self._stage_conversion)
+
+    def _stage_conversion(self):
+        np = _numpy()
+        stage_count = len(self.stages["stage_id"])
+
+        stage_index = self._stage_index(np, self.visits["stage_id"])
+        known = stage_index >= 0
+        visit_deal = self.visits["deal_id"][known]
+        stage_index = stage_index[known]
+
+        # Visits are sorted by deal and entry time, so a visit converted if a later one has a higher order
+        visit_order = self.stages["order_nr"][stage_index]
+        visit_converted = _later_max(np, visit_deal, visit_order) > visit_order
+
+        # Count every (deal, stage) pair once, however often the deal re-entered the stage
+        pairs, pair_index = np.unique(np.stack((visit_deal, stage_index), axis=1), axis=0, return_inverse=True)
+        pair_deal, pair_stage = pairs[:, 0], pairs[:, 1]
+        pair_converted = np.zeros(len(pairs), dtype=bool)
+        np.logical_or.at(pair_converted, pair_index.ravel(), visit_converted)
+
+        deal_ids = self.deals["deal_id"]
+        won_ids = deal_ids[self.deals["status"] == "won"]
+        converted = pair_converted | np.isin(pair_deal, won_ids)
+        entered = np.bincount(pair_stage, minlength=stage_count)
+        converted_count = np.bincount(pair_stage, weights=converted, minlength=stage_count).astype("int64")
+
+        return {
+            int(stage_id): {
+                "entered": int(entered[i]),
+                "converted": int(converted_count[i]),
+                "rate": float(converted_count[i] / entered[i]) if entered[i] else 0.0,
+            }
+            for i, stage_id in enumerate(self.stages["stage_id"])
+        }
+
+    def time_in_stage(self) -> Dict[int, Dict[str, float]]:
+        """
+        Time deals spent in each stage, in seconds.
+
+        Visits of open deals run until ``as_of``.
+
+        Returns:
+            Mapping of stage id to {"visits", "total", "mean", "median", "max"}
+        """
+        return self._memoize("time_in_stage", self._time_in_stage)
+
+    def _time_in_stage(self):
+        np = _numpy()
+
+        durations = self.visits["left_at"] - self.visits["entered_at"]
+        stage_index = self._stage_index(np, self.visits["stage_id"])
+        valid = (stage_index >= 0) & ~np.isnan(durations)
+        durations = np.maximum(durations[valid], 0.0)
+        stage_index = stage_index[valid]
+
+        order = np.lexsort((durations, stage_index))
+        durations = durations[order]
+        stage_index = stage_index[order]
+
+        starts = _group_starts(np, stage_index)
+        counts = np.diff(np.concatenate((starts, [len(stage_index)])))
+        totals = np.add.reduceat(durations, starts) if len(starts) else np.zeros(0)
+        maxima = durations[starts + counts - 1] if len(starts) else np.zeros(0)
+        medians = (durations[starts + (counts - 1) // 2] + durations[starts + counts // 2]) / 2.0
+
+        result = {}
+        for i, start in enumerate(starts):
+            stage_id = int(self.stages["stage_id"][stage_index[start]])
+            result[stage_id] = {
+                "visits": int(counts[i]),
+                "total": float(totals[i]),
+                "mean": float(totals[i] / counts[i]),
+                "median": float(medians[i]),
+                "max": float(maxima[i]),
+            }
+        return result
+
+    def weighted_pipeline_value(self) -> Dict[str, Any]:
+        """
+        Value of open deals weighted by their win probability.
+
+        The deal's own probability is used when set, otherwise the stage's
+        deal_probability. Values are summed as-is, so convert currencies first
+        if the pipeline mixes them.
+
+        Returns:
+            {"total": weighted value, "by_stage": {stage id: {"deals", "value", "weighted_value"}}}
+        """
+        return self._memoize("weighted_pipeline_value", self._weighted_pipeline_value)
+
+    def _weighted_pipeline_value(self):
+        np = _numpy()
+        stage_count = len(self.stages["stage_id"])
+
+        open_deals = self.deals["status"] == "open"
+        stage_index = self._stage_index(np, self.deals["stage_id"])
+        mask = open_deals & (stage_index >= 0)
+        stage_index = stage_index[mask]
+        value = self.deals["value"][mask]
+
+        probability = self.deals["probability"][mask]
+        probability = np.where(np.isnan(probability), self.stages["probability"][stage_index], probability)
+        weighted = value * np.nan_to_num(probability, nan=100.0) / 100.0
+
+        deals = np.bincount(stage_index, minlength=stage_count)
+        values = np.bincount(stage_index, weights=value, minlength=stage_count)
+        weighted_values = np.bincount(stage_index, weights=weighted, minlength=stage_count)
+
+        return {
+            "total": float(weighted_values.sum()),
+            "by_stage": {
+                int(stage_id): {
+                    "deals": int(deals[i]),
+                    "value": float(values[i]),
+                    "weighted_value": float(weighted_values[i]),
+                }
+                for i, stage_id in enumerate(self.stages["stage_id"])
+            },
+        }
+
+    def to_arrow(self):
+        """
+        Export the stage visits as a pyarrow.Table.
+
+        Returns:
+            Table with columns deal_id, stage_id, entered_at, left_at
+        """
+        try:
+            pa = importlib.import_module("pyarrow")
+        except ImportError as e:
+            raise ImportError("to_arrow requires pyarrow: pip install pyarrow") from e
+        return pa.table(self.visits)
+
+
+async def load(client, pipeline_id, as_of: Optional[float] = None, max_in_flight: Optional[int] = None,
+               flow_history=None, **kwargs) -> PipelineAnalytics:
+    """
+    Fetch a pipeline's stages, deals and deal flows and build PipelineAnalytics.
+
+    Args:
+        client: Client instance
+        pipeline_id: Pipeline to analyse
+        as_of: Epoch seconds treated as "now" for open deals (defaults to now)
+        max_in_flight: Maximum number of concurrent flow requests (defaults to concurrency_limit)
+        flow_history: Optional FlowHistory; flows are then synced incrementally into its store
+        **kwargs: Additional arguments to pass to each request
+
+    Returns:
+        PipelineAnalytics instance
+    """
+    stages = await client.stages.get_all_stages(params={"pipeline_id": pipeline_id}, **kwargs)
+    stages = (stages or {}).get("data") or []
+
+    deals = await client.paginate(client.BASE_URL + "pipelines/{}/deals".format(pipeline_id), **kwargs)
+
+    deal_ids = [deal["id"] for deal in deals]
+    if flow_history is not None:
+        await flow_history.sync(deal_ids, **kwargs)
+        return PipelineAnalytics.from_records(deals, flow_history.flows(deal_ids), stages, as_of=as_of)
+
+    urls = (client.BASE_URL + "deals/{}/flow".format(deal_id) for deal_id in deal_ids)
+    flows = {}
+    async for index, response in client.batch_get_stream(urls, max_in_flight=max_in_flight, **kwargs):
+        if isinstance(response, BaseException):
+            raise response
+        flows[deal_ids[index]] = (response or {}).get("data") or []
+
+    return PipelineAnalytics.from_records(deals, flows, stages, as_of=as_of)
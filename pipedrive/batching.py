@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, AsyncIterable, AsyncIterator, Tuple, Union
+
+
+async def aiter_items(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    """Iterate over a regular or async iterable with ``async for``."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def bounded_map(func: Callable[[Any], Awaitable[Any]], items: Union[Iterable, AsyncIterable], limit: int,
+                      ordered: bool = False, return_exceptions: bool = False) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Run ``func(item)`` for every item, with at most ``limit`` calls pending at a time.
+
+    Items are pulled from the source lazily, so memory use stays flat however
+    many items it produces. Calls still pending when the consumer stops early
+    or an error is raised are cancelled.
+
+    Args:
+        func: Coroutine function called with each item
+        items: Iterable or async iterable of items
+        limit: Maximum number of pending calls
+        ordered: Yield results in input order instead of completion order
+        return_exceptions: Yield exceptions as results instead of raising the first one
+
+    Yields:
+        (index, result) tuples, where index is the position of the item in the source
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = aiter_items(items)
+    pending = {}
+    completed = {}
+    next_index = 0
+    next_to_yield = 0
+    exhausted = False
+
+    try:
+        while True:
+            # Top up the pending set; in ordered mode buffered results count against the limit
+            while not exhausted and len(pending) + len(completed) < limit:
+                try:
+                    item = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(func(item))] = next_index
+                next_index += 1
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            results = []
+            for task in done:
+                if task.cancelled():
+                    result = asyncio.CancelledError()
+                else:
+                    # Retrieve every exception in the set, so none is reported as never retrieved
+                    result = task.exception() or task.result()
+                results.append((pending.pop(task), result))
+
+            for index, result in results:
+                if isinstance(result, BaseException) and not return_exceptions:
+                    raise result
+                if ordered:
+                    completed[index] = result
+                else:
+                    yield index, result
+
+            while next_to_yield in completed:
+                yield next_to_yield, completed.pop(next_to_yield)
+                next_to_yield += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Let the cancelled calls finish unwinding before the caller moves on
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class BatchResult:
+    """
+    Counters describing a run of one of the bulk helpers.
+
+    Subclasses name their counters in ``COUNTERS``; each starts at zero.
+    ``errors`` maps the key of every failed item to its exception.
+    """
+
+    COUNTERS: Tuple[str, ...] = ()
+
+    def __init__(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.errors = {}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__, ", ".join("{}={}".format(k, v) for k, v in self.as_dict().items())
+        )
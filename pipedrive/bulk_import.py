@@ -0,0 +1,296 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Dict, Any, Callable, Awaitable, Iterable, AsyncIterable, Union
+
+from pipedrive import exceptions
+from pipedrive.batching import aiter_items, bounded_map, BatchResult
+from pipedrive.scheduler import BULK
+
+# Journal states
+SUBMITTED = "submitted"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def idempotency_key(record: Dict[str, Any]) -> str:
+    """
+    Derive a stable idempotency key from the content of a record.
+
+    Args:
+        record: Payload that will be sent to the create endpoint
+
+    Returns:
+        Hex digest that is identical for identical payloads across runs
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _in_doubt(error: exceptions.ApiError) -> bool:
+    """
+    Whether a failed create may nonetheless have been applied by Pipedrive.
+
+    Network errors (no response at all), timeouts and server/gateway errors can
+    happen after the object was created; other 4xx statuses are definite rejections.
+    """
+    status = getattr(error.response, "status", None)
+    return status is None or status == 408 or status >= 500
+
+
+class ImportJournal:
+    """
+    Append-only JSON Lines log of submitted create operations and their outcomes.
+
+    Every operation is written as ``submitted`` before the request is sent and as
+    ``succeeded``/``failed`` once the outcome is known. Replaying the file gives
+    the latest state per idempotency key, so a crashed import can tell finished
+    work (skip), failed work (retry) and in-doubt work (submitted, no outcome)
+    apart.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Open the journal, replaying existing entries.
+
+        Args:
+            path: Location of the journal file (created if missing)
+            fsync: Flush every entry to disk before the request proceeds
+        """
+        self.path = path
+        self.fsync = fsync
+        self.entries = {}
+        self._file = None
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-write; the operation stays in doubt
+                        continue
+                    self.entries[entry["key"]] = entry
+
+    def open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def state(self, key: str) -> Optional[str]:
+        """Get the latest state recorded for a key, or None if it was never submitted."""
+        entry = self.entries.get(key)
+        return entry["state"] if entry else None
+
+    def record(self, key: str, state: str, index: Optional[int] = None, **fields):
+        """
+        Append an entry for a key.
+
+        Args:
+            key: Idempotency key of the operation
+            state: One of SUBMITTED, SUCCEEDED or FAILED
+            index: Position of the record in the input
+            **fields: Extra data to store, e.g. the created object id or an error message
+        """
+        entry = {"key": key, "state": state, "index": index, "ts": time.time()}
+        entry.update(fields)
+        self.entries[key] = entry
+
+        self.open()
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ImportResult(BatchResult):
+    """Counters describing a bulk import run."""
+
+    COUNTERS = ("total", "skipped", "created", "recovered", "failed", "in_doubt")
+
+
+class BulkImporter:
+    """
+    Resumable, duplicate-safe bulk creation of Pipedrive objects.
+
+    Each record gets a client-side idempotency key, and every submission and
+    its outcome goes to an ImportJournal. Running the importer again with the
+    same journal skips records that already succeeded. Create requests are sent
+    with retries disabled, so a network error never blindly re-POSTs a record.
+    After a network error, timeout or 5xx response a record stays "in doubt"
+    until ``lookup`` confirms whether the object was created, e.g. by searching
+    a custom field that ``key_field`` stamps with the key. Only definite 4xx
+    rejections are journaled as failed.
+
+    Example:
+        importer = BulkImporter(
+            client.persons.create_person, "persons.journal",
+            key_field="a1b2c3...",  # custom field holding the import key
+            lookup=BulkImporter.search_lookup(client.persons.search_persons),
+        )
+        result = await importer.run(records)
+    """
+
+    def __init__(
+        self,
+        create: Callable[..., Awaitable[Any]],
+        journal: Union[str, ImportJournal],
+        key_func: Optional[Callable[[Dict[str, Any]], str]] = None,
+        key_field: Optional[str] = None,
+        lookup: Optional[Callable[[str], Awaitable[Optional[Any]]]] = None,
+        concurrency: int = 5,
+        retry_failed: bool = True,
+    ):
+        """
+        Initialize the importer.
+
+        Args:
+            create: Resource method that creates one object, e.g. client.persons.create_person
+            journal: Journal path or an open ImportJournal
+            key_func: Function deriving the idempotency key of a record (defaults to a content hash)
+            key_field: Field (usually a custom field key) the idempotency key is written to
+            lookup: Coroutine function returning the id of the object created for a key, or None.
+                A lookup built with search_lookup needs ``key_field``: without the key stamped on
+                the object the search finds nothing and in-doubt records would be created again
+            concurrency: Maximum number of create requests in flight
+            retry_failed: Resubmit records whose previous attempt was rejected (4xx other than 408)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if getattr(lookup, "searches_key_field", False) and not key_field:
+            raise ValueError("search_lookup requires key_field, otherwise in-doubt records are duplicated")
+
+        self.create = create
+        self.journal = journal if isinstance(journal, ImportJournal) else ImportJournal(journal)
+        self.key_func = key_func or idempotency_key
+        self.key_field = key_field
+        self.lookup = lookup
+        self.concurrency = concurrency
+        self.retry_failed = retry_failed
+
+    @staticmethod
+    def search_lookup(search: Callable[..., Awaitable[Any]], field_type: str = "custom_fields"):
+        """
+        Build a lookup that finds an object by its import key through a search endpoint.
+
+        The importer must be given ``key_field``, which is where the key is searched for.
+
+        Args:
+            search: Resource search method, e.g. client.persons.search_persons
+            field_type: Value of the search ``fields`` parameter that covers key_field
+                ("custom_fields" unless the key is stamped on a built-in field)
+
+        Returns:
+            Coroutine function usable as BulkImporter's ``lookup``
+        """
+        async def lookup(key):
+            response = await search(params={"term": key, "fields": field_type, "exact_match": "true"})
+            items = ((response or {}).get("data") or {}).get("items") or []
+            if not items:
+                return None
+            return items[0].get("item", {}).get("id")
+
+        lookup.searches_key_field = True
+        return lookup
+
+    async def run(self, records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]) -> ImportResult:
+        """
+        Import records, resuming from the journal.
+
+        Args:
+            records: Iterable or async iterable of create payloads, in a stable order
+
+        Returns:
+            ImportResult with per-outcome counts
+        """
+        result = ImportResult()
+        with self.journal:
+            pending = self._pending(records, result)
+            async for _ in bounded_map(lambda item: self._import_one(*item, result), pending, self.concurrency):
+                pass
+
+        return result
+
+    async def _pending(self, records, result):
+        """Yield (index, record) for the records that still need to be imported."""
+        index = 0
+        async for record in aiter_items(records):
+            result.total += 1
+            if self._needs_work(record, result):
+                yield index, record
+            index += 1
+
+    def _needs_work(self, record, result):
+        state = self.journal.state(self.key_func(record))
+        if state == SUCCEEDED or (state == FAILED and not self.retry_failed):
+            result.skipped += 1
+            return False
+        return True
+
+    async def _import_one(self, index, record, result):
+        key = self.key_func(record)
+
+        # Submitted on a previous run without a recorded outcome: find out before re-sending
+        if self.journal.state(key) == SUBMITTED:
+            if not await self._resolve(key, index, result):
+                return
+
+        payload = dict(record)
+        if self.key_field:
+            payload[self.key_field] = key
+
+        self.journal.record(key, SUBMITTED, index)
+        try:
+            response = await self.create(payload, retry=False, priority=BULK)
+        except exceptions.ApiError as e:
+            # The request may have been applied before the connection or gateway failed
+            if _in_doubt(e) and not await self._resolve(key, index, result):
+                return
+            self.journal.record(key, FAILED, index, error=str(e))
+            result.failed += 1
+            result.errors[index] = e
+            return
+
+        object_id = None
+        if isinstance(response, dict):
+            object_id = (response.get("data") or {}).get("id")
+        self.journal.record(key, SUCCEEDED, index, id=object_id)
+        result.created += 1
+
+    async def _resolve(self, key, index, result):
+        """
+        Settle an in-doubt operation with ``lookup``.
+
+        Returns:
+            True if the object does not exist (it is safe to submit again), False otherwise
+        """
+        if self.lookup is None:
+            result.in_doubt += 1
+            return False
+
+        try:
+            object_id = await self.lookup(key)
+        except exceptions.ApiError:
+            result.in_doubt += 1
+            return False
+
+        if object_id is not None:
+            self.journal.record(key, SUCCEEDED, index, id=object_id, recovered=True)
+            result.recovered += 1
+            return False
+        return True
@@ -1,32 +1,87 @@
-from urllib.parse import urlencode
 import asyncio
+import importlib
+import logging
 import random
 import time
-from typing import Optional, Dict, Any, List, Tuple, Union
-
-import aiohttp
-from aiohttp.client_exceptions import ClientError, ServerTimeoutError, ClientConnectorError
+from contextlib import aclosing, nullcontext
+from typing import Optional, Dict, Any, List, Tuple, Union, Iterable, AsyncIterable, AsyncIterator
 
 from pipedrive import exceptions
-from pipedrive.activities import Activities
-from pipedrive.deals import Deals
-from pipedrive.filters import Filters
-from pipedrive.leads import Leads
-from pipedrive.items import Items
-from pipedrive.notes import Notes
-from pipedrive.organizations import Organizations
-from pipedrive.persons import Persons
-from pipedrive.pipelines import Pipelines
-from pipedrive.products import Products
-from pipedrive.stages import Stages
-from pipedrive.recents import Recents
-from pipedrive.subscriptions import Subscriptions
-from pipedrive.users import Users
-from pipedrive.webhooks import Webhooks
+from pipedrive.batching import bounded_map
+from pipedrive.scheduler import PriorityScheduler, NORMAL, BULK
+from pipedrive.transports import Transport, AiohttpTransport
+from pipedrive.tracing import Tracer, NOOP_SPAN, endpoint_template
+
+logger = logging.getLogger(__name__)
+
+
+class _Resource:
+    """
+    Descriptor that creates a resource object on first access.
+
+    The resource module is only imported when the attribute is first read, and the
+    instance is then cached in the client's __dict__ so later lookups bypass the
+    descriptor entirely.
+    """
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self.attr = None
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        resource_class = getattr(importlib.import_module(self.module), self.class_name)
+        resource = resource_class(instance)
+        instance.__dict__[self.attr] = resource
+        return resource
+
+
+def _ijson():
+    """Import ijson if installed; it enables incremental decoding in stream_items."""
+    try:
+        return importlib.import_module("ijson")
+    except ImportError:
+        return None
+
+
+class _RetryableStatus(Exception):
+    """Raised by _parse so the retry happens after the scheduler slot has been released."""
+    pass
+
+
+def _lookup(data, key):
+    """Look up a dot-separated key in nested dicts, returning None when it is missing."""
+    for part in key.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
 
 
 class Client:
     BASE_URL = "https://api.pipedrive.com/api/v2/"
+
+    # Resource classes, created on first access
+    activities = _Resource("pipedrive.activities", "Activities")
+    deals = _Resource("pipedrive.deals", "Deals")
+    filters = _Resource("pipedrive.filters", "Filters")
+    leads = _Resource("pipedrive.leads", "Leads")
+    items = _Resource("pipedrive.items", "Items")
+    notes = _Resource("pipedrive.notes", "Notes")
+    organizations = _Resource("pipedrive.organizations", "Organizations")
+    persons = _Resource("pipedrive.persons", "Persons")
+    pipelines = _Resource("pipedrive.pipelines", "Pipelines")
+    products = _Resource("pipedrive.products", "Products")
+    subscriptions = _Resource("pipedrive.subscriptions", "Subscriptions")
+    recents = _Resource("pipedrive.recents", "Recents")
+    stages = _Resource("pipedrive.stages", "Stages")
+    users = _Resource("pipedrive.users", "Users")
+    webhooks = _Resource("pipedrive.webhooks", "Webhooks")
     
     # Default request timeout in seconds
     DEFAULT_TIMEOUT = 30
@@ -53,6 +108,9 @@ class Client:
         max_retries: int = MAX_RETRIES,
         tcp_connector_limit: Optional[int] = 100,
         tcp_connector_limit_per_host: Optional[int] = 0,  # 0 means no limit
+        priority_weights: Optional[Dict[str, int]] = None,
+        transport: Optional[Transport] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """
         Initialize the Pipedrive API client.
@@ -65,32 +123,28 @@ class Client:
             max_retries: Maximum number of retry attempts for failed requests
             tcp_connector_limit: Maximum number of connections (overall)
             tcp_connector_limit_per_host: Maximum number of connections per host
+            priority_weights: Relative weights of the interactive/normal/bulk priority classes
+            transport: HTTP backend to use (defaults to an AiohttpTransport built from the
+                timeout and tcp_connector_* settings)
+            tracer: Tracer that records a span per request (None disables tracing)
         """
         self.api_token = api_token
-        self.session = None
         self.timeout = timeout
         self.concurrency_limit = concurrency_limit
         self.max_retries = max_retries
         self.tcp_connector_limit = tcp_connector_limit
         self.tcp_connector_limit_per_host = tcp_connector_limit_per_host
-        self._semaphore = None  # Will be initialized in __aenter__
-        
-        # Initialize resource classes
-        self.activities = Activities(self)
-        self.deals = Deals(self)
-        self.filters = Filters(self)
-        self.leads = Leads(self)
-        self.items = Items(self)
-        self.notes = Notes(self)
-        self.organizations = Organizations(self)
-        self.persons = Persons(self)
-        self.pipelines = Pipelines(self)
-        self.products = Products(self)
-        self.subscriptions = Subscriptions(self)
-        self.recents = Recents(self)
-        self.stages = Stages(self)
-        self.users = Users(self)
-        self.webhooks = Webhooks(self)
+        self.priority_weights = priority_weights
+        self._scheduler = None  # Will be initialized in __aenter__
+
+        if transport is None:
+            transport = AiohttpTransport(
+                timeout=timeout,
+                limit=tcp_connector_limit,
+                limit_per_host=tcp_connector_limit_per_host,
+            )
+        self.transport = transport
+        self.tracer = tracer
 
         if domain:
             if not domain.endswith("/"):
@@ -99,39 +153,39 @@ class Client:
 
     async def __aenter__(self):
         """Set up the client session when entering the context manager."""
-        # Create a TCP connector with connection pooling
-        connector = aiohttp.TCPConnector(
-            limit=self.tcp_connector_limit,
-            limit_per_host=self.tcp_connector_limit_per_host,
-            enable_cleanup_closed=True,
-        )
-        
-        # Create the client session with default headers and timeout
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={
-                "User-Agent": "pipedrive-python/1.0",
-                "Accept": "application/json",
-            },
-        )
+        if not self.transport.is_open:
+            await self.transport.open()
         
-        # Initialize the semaphore for concurrency control
-        self._semaphore = asyncio.Semaphore(self.concurrency_limit)
+        # Initialize the priority scheduler for concurrency control
+        self._scheduler = PriorityScheduler(self.concurrency_limit, self.priority_weights)
         
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up resources when exiting the context manager."""
-        if self.session:
-            await self.session.close()
-            self.session = None
-        self._semaphore = None
+        await self.transport.close()
+        self._scheduler = None
+
+    @property
+    def session(self):
+        """The underlying aiohttp session when using the default transport, otherwise None."""
+        return getattr(self.transport, "session", None)
 
     def set_api_token(self, api_token):
         """Set the API token for authentication."""
         self.api_token = api_token
 
+    def get_scheduler_stats(self):
+        """
+        Get queue depth and wait-time statistics for each request priority class.
+
+        Returns:
+            Mapping of priority class to its statistics (empty outside the context manager)
+        """
+        if not self._scheduler:
+            return {}
+        return self._scheduler.stats()
+
     async def _get(self, url, params=None, **kwargs):
         """Send a GET request."""
         return await self._request("get", url, params=params, **kwargs)
@@ -159,24 +213,78 @@ class Client:
         Args:
             urls: List of URLs to request
             params_list: List of query parameters for each URL (optional)
-            **kwargs: Additional arguments to pass to each request
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
             
         Returns:
             List of responses in the same order as the input URLs
         """
+        kwargs.setdefault("priority", BULK)
+
         if params_list is None:
             params_list = [None] * len(urls)
         
         if len(params_list) != len(urls):
             raise ValueError("params_list length must match urls length")
         
-        # Create tasks for each request
-        tasks = []
-        for i, url in enumerate(urls):
-            tasks.append(self._get(url, params=params_list[i], **kwargs))
-        
-        # Execute requests with gather for concurrency
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        with self._span("batch_get", {"pipedrive.batch_size": len(urls)}):
+            # Create tasks for each request
+            tasks = []
+            for i, url in enumerate(urls):
+                tasks.append(self._get(url, params=params_list[i], **kwargs))
+
+            # Execute requests with gather for concurrency
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def batch_get_stream(self, requests: Union[Iterable, AsyncIterable], max_in_flight: Optional[int] = None,
+                               ordered: bool = False, **kwargs) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Execute GET requests from a (possibly async) iterable, yielding results as they complete.
+
+        Unlike batch_get, requests are pulled from the source lazily and at most
+        ``max_in_flight`` of them are pending at a time, so memory use stays flat
+        regardless of how many requests the source produces.
+
+        Args:
+            requests: Iterable or async iterable of URLs or (url, params) tuples
+            max_in_flight: Maximum number of pending requests (defaults to concurrency_limit)
+            ordered: Yield results in input order instead of completion order
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Yields:
+            (index, result) tuples, where result is the parsed response or the raised exception
+        """
+        if max_in_flight is None:
+            max_in_flight = self.concurrency_limit
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        kwargs.setdefault("priority", BULK)
+
+        # The batch span is never made current here: an async generator must not leave
+        # context variables set between yields, so each request task attaches it instead
+        batch_span = self.tracer.start_span("batch_get_stream") if self.tracer is not None else None
+        submitted = 0
+
+        def get(request):
+            nonlocal submitted
+            submitted += 1
+            if isinstance(request, (tuple, list)):
+                url, params = request
+            else:
+                url, params = request, None
+            coro = self._get(url, params=params, **kwargs)
+            if batch_span is not None:
+                coro = self._with_parent_span(batch_span, coro)
+            return coro
+
+        try:
+            async with aclosing(bounded_map(get, requests, max_in_flight, ordered=ordered,
+                                            return_exceptions=True)) as results:
+                async for index, result in results:
+                    yield index, result
+        finally:
+            if batch_span is not None:
+                batch_span.set_attribute("pipedrive.batch_size", submitted)
+                self.tracer.end_span(batch_span)
 
     async def paginate(self, url, params=None, limit_key="limit", start_key="start", 
                       items_key="data", total_key="additional_data.pagination.total_count", 
@@ -193,14 +301,24 @@ class Client:
             total_key: Response key containing total count (dot notation for nested keys)
             page_size: Number of items per page
             max_items: Maximum number of items to retrieve (None for all)
-            **kwargs: Additional arguments to pass to each request
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
             
         Returns:
             List of all items across pages
         """
+        kwargs.setdefault("priority", BULK)
+
         if params is None:
             params = {}
         
+        with self._span("paginate", {"pipedrive.endpoint": endpoint_template(url, self.BASE_URL)}) as span:
+            all_items = await self._paginate(url, params, limit_key, start_key, items_key, total_key,
+                                             page_size, max_items, **kwargs)
+            span.set_attribute("pipedrive.items", len(all_items))
+        return all_items
+
+    async def _paginate(self, url, params, limit_key, start_key, items_key, total_key, page_size, max_items,
+                        **kwargs):
         all_items = []
         start = 0
         params[limit_key] = page_size
@@ -222,13 +340,7 @@ class Client:
                 break
                 
             # Get total count using dot notation
-            total = response
-            for key in total_key.split('.'):
-                if isinstance(total, dict):
-                    total = total.get(key, {})
-                else:
-                    total = 0
-                    break
+            total = _lookup(response, total_key)
             
             # If we've retrieved all items or there's no pagination info, break
             if not isinstance(total, (int, float)) or len(all_items) >= total:
@@ -238,75 +350,330 @@ class Client:
             
         return all_items
 
-    async def _request(self, method, url, headers=None, params=None, retry_count=0, **kwargs):
+    async def stream_items(self, url, params=None, items_key="data", chunk_size=65536, **kwargs):
         """
-        Send an HTTP request with retry logic, error handling, and concurrency control.
-        
+        Yield the items of a single list response while the body is still being received.
+
+        When ijson is installed the JSON array under ``items_key`` is decoded
+        incrementally from the (decompressed) byte stream, so the first items are
+        available before the page has been fully downloaded and the full body is
+        never held in memory. Without ijson the page is fetched with _get and its
+        items are yielded afterwards. The request keeps its scheduler slot until
+        the page has been consumed.
+
         Args:
-            method: HTTP method (get, post, put, delete, etc.)
             url: URL to request
-            headers: Request headers
             params: Query parameters
-            retry_count: Current retry attempt (used internally)
+            items_key: Top-level response key containing the items
+            chunk_size: Size of the chunks read from the transport
             **kwargs: Additional arguments to pass to the request
-            
+
+        Yields:
+            Items of the response, in order
+        """
+        async with aclosing(self._stream_page(url, params, items_key, None, chunk_size, {}, **kwargs)) as items:
+            async for item in items:
+                yield item
+
+    async def _stream_page(self, url, params, items_key, total_key, chunk_size, page, parent=None, **kwargs):
+        """
+        Implementation of stream_items; stores the value found under ``total_key`` in page["total"].
+
+        ``parent`` is the span the request span is parented to (defaults to the current span).
+        """
+        ijson = _ijson()
+        if ijson is None:
+            request = self._get(url, params=params, **kwargs)
+            if parent is not None:
+                request = self._with_parent_span(parent, request)
+            response = await request
+            if total_key:
+                page["total"] = _lookup(response, total_key)
+            for item in (response.get(items_key) or [] if isinstance(response, dict) else []):
+                yield item
+            return
+
+        headers = kwargs.pop("headers", None)
+        _headers, _params = self._prepare_request(headers, params)
+        request_kwargs = dict(kwargs)
+        priority = request_kwargs.pop("priority", None) or NORMAL
+        retry = request_kwargs.pop("retry", True)
+
+        if not self.transport.is_open:
+            await self.transport.open()
+
+        # Items are yielded while the request is open, so its span must not become the current span
+        span = self._start_span(*self._request_span("GET", url, priority, 0), parent=parent)
+        count = 0
+        received = None
+        slot = self._scheduler.slot(priority) if self._scheduler else nullcontext(0.0)
+        try:
+            try:
+                async with slot as queue_wait:
+                    span.set_attribute("pipedrive.queue_wait", queue_wait)
+                    async with self.transport.request(
+                        "GET", url, headers=_headers, params=_params, **request_kwargs
+                    ) as response:
+                        self._record_response(span, response)
+                        content_type = response.headers.get("Content-Type", "")
+                        if response.ok and "application/json" in content_type:
+                            received = 0
+                            items = ijson.sendable_list()
+                            parser = ijson.items_coro(items, items_key + ".item", use_float=True)
+                            # The total usually follows the items, so it gets its own parser over the same chunks
+                            totals = ijson.sendable_list()
+                            total_parser = ijson.items_coro(totals, total_key, use_float=True) if total_key else None
+                            async for chunk in self.transport.iter_content(response, chunk_size):
+                                received += len(chunk)
+                                parser.send(chunk)
+                                if total_parser is not None:
+                                    total_parser.send(chunk)
+                                for item in items:
+                                    count += 1
+                                    yield item
+                                del items[:]
+                            parser.close()
+                            if total_parser is not None:
+                                total_parser.close()
+                                page["total"] = totals[0] if totals else None
+                            for item in items:
+                                count += 1
+                                yield item
+                            return
+
+                        # Errors and retries go through the regular parsing path
+                        result = await self._parse(response, "GET", url, _headers, _params, 0, span=span, **kwargs)
+            except _RetryableStatus:
+                result = await self._retry_stream_page(url, headers, params, None, span, **kwargs)
+            except self.transport.network_errors as e:
+                # Until the first item is yielded the page can be requested again like any GET
+                if count or not retry or not self.max_retries:
+                    raise self._network_error(e, url) from e
+                result = await self._retry_stream_page(url, headers, params, e, span, **kwargs)
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.set_attribute("pipedrive.items", count)
+            if received is not None:
+                span.set_attribute("http.response_content_length", received)
+            self._end_span(span)
+
+        if total_key:
+            page["total"] = _lookup(result, total_key)
+        for item in (result.get(items_key) or [] if isinstance(result, dict) else []):
+            yield item
+
+    def _retry_stream_page(self, url, headers, params, exception, span, **kwargs):
+        """Retry a page of stream_items through _request, parented to the span of the failed attempt."""
+        retry = self._retry_request("GET", url, headers, params, 0, exception, span=span, **kwargs)
+        if self.tracer is not None:
+            retry = self._with_parent_span(span, retry)
+        return retry
+
+    async def paginate_stream(self, url, params=None, limit_key="limit", start_key="start",
+                              items_key="data", total_key="additional_data.pagination.total_count",
+                              page_size=100, max_items=None, **kwargs):
+        """
+        Like paginate, but yield items one at a time as each page is decoded.
+
+        Pages are requested until an empty page is returned or as many items as
+        the total count under ``total_key`` have been received, like paginate.
+
+        Args:
+            url: Base URL to request
+            params: Query parameters
+            limit_key: Parameter name for page size
+            start_key: Parameter name for offset/start
+            items_key: Response key containing items
+            total_key: Response key containing total count (dot notation for nested keys)
+            page_size: Number of items per page
+            max_items: Maximum number of items to retrieve (None for all)
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Yields:
+            Items across all pages
+        """
+        kwargs.setdefault("priority", BULK)
+        params = dict(params or {})
+        params[limit_key] = page_size
+        start = 0
+        count = 0
+
+        # Like batch_get_stream, the span is passed to each page instead of being made current
+        span = self._start_span("paginate_stream", {"pipedrive.endpoint": endpoint_template(url, self.BASE_URL)})
+        parent = span if self.tracer is not None else None
+        try:
+            while True:
+                params[start_key] = start
+                page = {}
+                page_count = 0
+                # aclosing releases the page's scheduler slot right away when we stop early
+                async with aclosing(self._stream_page(url, dict(params), items_key, total_key, 65536, page,
+                                                      parent=parent, **kwargs)) as items:
+                    async for item in items:
+                        yield item
+                        page_count += 1
+                        count += 1
+                        if max_items is not None and count >= max_items:
+                            return
+
+                # Same termination as paginate: an empty page, no pagination info, or all items received
+                total = page.get("total")
+                if not page_count or not isinstance(total, (int, float)) or count >= total:
+                    break
+                start += page_count
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.set_attribute("pipedrive.items", count)
+            self._end_span(span)
+
+    def _span(self, name, attributes=None):
+        """Start a span if tracing is enabled; a shared no-op otherwise."""
+        if self.tracer is None:
+            return NOOP_SPAN
+        return self.tracer.span(name, attributes)
+
+    def _start_span(self, name, attributes=None, parent=None):
+        """
+        Start a span without making it current, for use across the yields of an async generator.
+
+        Args:
+            name: Span name
+            attributes: Initial span attributes
+            parent: Span to parent it to (defaults to the current span)
+
         Returns:
-            Parsed response data
+            The span, or a shared no-op span if tracing is disabled; finish it with _end_span()
         """
-        method = method.upper()
+        if self.tracer is None:
+            return NOOP_SPAN
+        if parent is None:
+            return self.tracer.start_span(name, attributes)
+        token = self.tracer.attach(parent)
+        try:
+            return self.tracer.start_span(name, attributes)
+        finally:
+            self.tracer.detach(token)
+
+    def _end_span(self, span):
+        if span is not NOOP_SPAN:
+            self.tracer.end_span(span)
+
+    def _request_span(self, method, url, priority, retry_count):
+        """Name and attributes of a request span; only the endpoint template is recorded, as URLs carry ids."""
+        endpoint = endpoint_template(url, self.BASE_URL)
+        return f"{method} {endpoint}", {
+            "http.method": method,
+            "pipedrive.endpoint": endpoint,
+            "pipedrive.priority": priority,
+            "pipedrive.retry_count": retry_count,
+        }
+
+    @staticmethod
+    def _record_response(span, response):
+        span.set_attribute("http.status_code", response.status)
+
+    async def _with_parent_span(self, span, coro):
+        """Await ``coro`` with ``span`` as the current span of this task."""
+        token = self.tracer.attach(span)
+        try:
+            return await coro
+        finally:
+            self.tracer.detach(token)
+
+    def _prepare_request(self, headers, params):
+        """Merge authentication with the caller's headers and query parameters."""
         _headers = {}
         _params = {}
-        
+
         # Set up authentication with API token
         if self.api_token:
             _params["api_token"] = self.api_token
-            
+
         # Merge with provided headers and params
         if headers:
             _headers.update(headers)
         if params:
             _params.update(params)
+
+        return _headers, _params
+
+    def _network_error(self, error, url):
+        """Build the exception raised for a network error once retries are exhausted."""
+        error_class = self.transport.error_class(error)
+        if error_class is exceptions.TimeoutError:
+            return exceptions.TimeoutError(f"Request timed out: {url}", None)
+        elif error_class is exceptions.ConnectionError:
+            return exceptions.ConnectionError(f"Connection error: {url}", None)
+        else:
+            return exceptions.ApiError(f"API request failed: {url}", None)
+
+    async def _request(self, method, url, headers=None, params=None, retry_count=0, **kwargs):
+        """
+        Send an HTTP request with retry logic, error handling, and concurrency control.
         
-        # Create session if it doesn't exist (should only happen outside context manager)
-        if not self.session:
-            connector = aiohttp.TCPConnector(
-                limit=self.tcp_connector_limit,
-                limit_per_host=self.tcp_connector_limit_per_host,
-            )
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-            )
+        Args:
+            method: HTTP method (get, post, put, delete, etc.)
+            url: URL to request
+            headers: Request headers
+            params: Query parameters
+            retry_count: Current retry attempt (used internally)
+            **kwargs: Additional arguments to pass to the request. ``priority`` selects the
+                scheduler class ("interactive", "normal" or "bulk", default "normal");
+                ``retry=False`` disables retries, e.g. for writes that must not be repeated
             
-        try:
-            # Use semaphore for concurrency control if available
-            if self._semaphore:
-                async with self._semaphore:
-                    async with self.session.request(
-                        method, url, headers=_headers, params=_params, **kwargs
-                    ) as response:
-                        return await self._parse(response, method, url, _headers, _params, retry_count, **kwargs)
-            else:
-                # Fallback if semaphore is not available (outside context manager)
-                async with self.session.request(
-                    method, url, headers=_headers, params=_params, **kwargs
-                ) as response:
-                    return await self._parse(response, method, url, _headers, _params, retry_count, **kwargs)
-                    
-        except (ClientError, asyncio.TimeoutError, ServerTimeoutError, ClientConnectorError) as e:
-            # Handle network-related errors with retry logic
-            if retry_count < self.max_retries and (method in self.IDEMPOTENT_METHODS or retry_count == 0):
-                return await self._retry_request(method, url, headers, params, retry_count, e, **kwargs)
+        Returns:
+            Parsed response data
+        """
+        method = method.upper()
+        _headers, _params = self._prepare_request(headers, params)
+
+        # Client-level options must not reach the transport
+        request_kwargs = dict(kwargs)
+        priority = request_kwargs.pop("priority", None) or NORMAL
+        retry = request_kwargs.pop("retry", True)
+
+        # Open the transport if needed (should only happen outside context manager)
+        if not self.transport.is_open:
+            await self.transport.open()
             
-            # If we've exhausted retries or it's not safe to retry, raise appropriate exception
-            if isinstance(e, asyncio.TimeoutError) or isinstance(e, ServerTimeoutError):
-                raise exceptions.TimeoutError(f"Request timed out: {url}", None) from e
-            elif isinstance(e, ClientConnectorError):
-                raise exceptions.ConnectionError(f"Connection error: {url}", None) from e
-            else:
-                raise exceptions.ApiError(f"API request failed: {url}", None) from e
+        traced = NOOP_SPAN
+        if self.tracer is not None:
+            # Only the endpoint template is recorded; the raw URL and params carry the api_token
+            traced = self.tracer.span(*self._request_span(method, url, priority, retry_count))
+
+        # Use the scheduler for concurrency control if available (not outside context manager)
+        slot = self._scheduler.slot(priority) if self._scheduler else nullcontext(0.0)
+
+        with traced as span:
+            try:
+                async with slot as queue_wait:
+                    span.set_attribute("pipedrive.queue_wait", queue_wait)
+                    async with self.transport.request(
+                        method, url, headers=_headers, params=_params, **request_kwargs
+                    ) as response:
+                        self._record_response(span, response)
+                        return await self._parse(response, method, url, _headers, _params, retry_count, span=span,
+                                                 **kwargs)
 
-    async def _retry_request(self, method, url, headers, params, retry_count, exception, **kwargs):
+            except _RetryableStatus:
+                # Retry outside the scheduler slot; waiting for a new slot while holding one can deadlock
+                return await self._retry_request(method, url, headers, params, retry_count, None, span=span,
+                                                 **kwargs)
+
+            except self.transport.network_errors as e:
+                # Handle network-related errors with retry logic
+                if retry and retry_count < self.max_retries and (method in self.IDEMPOTENT_METHODS or retry_count == 0):
+                    return await self._retry_request(method, url, headers, params, retry_count, e, span=span,
+                                                     **kwargs)
+
+                # If we've exhausted retries or it's not safe to retry, raise appropriate exception
+                raise self._network_error(e, url) from e
+
+    async def _retry_request(self, method, url, headers, params, retry_count, exception, span=NOOP_SPAN, **kwargs):
         """
         Implement retry logic with exponential backoff.
         
@@ -317,6 +684,7 @@ class Client:
             params: Query parameters
             retry_count: Current retry attempt
             exception: The exception that triggered the retry
+            span: Span of the failed attempt, which gets a "retry" event
             **kwargs: Additional arguments to pass to the request
             
         Returns:
@@ -333,8 +701,14 @@ class Client:
         jitter = delay * 0.3
         delay = delay + random.uniform(-jitter, jitter)
         
-        # Log the retry (in a real implementation, use a proper logger)
-        print(f"Retrying request to {url} after {delay:.2f}s (attempt {retry_count}/{self.max_retries})")
+        reason = type(exception).__name__ if exception is not None else "retryable status"
+        span.add_event("retry", {
+            "pipedrive.retry_count": retry_count,
+            "pipedrive.retry_delay": delay,
+            "pipedrive.retry_reason": reason,
+        })
+        logger.info("Retrying %s %s after %.2fs (attempt %d/%d, %s)", method, endpoint_template(url, self.BASE_URL),
+                    delay, retry_count, self.max_retries, reason)
         
         # Wait before retrying
         await asyncio.sleep(delay)
@@ -342,17 +716,18 @@ class Client:
         # Retry the request
         return await self._request(method, url, headers, params, retry_count, **kwargs)
 
-    async def _parse(self, response, method, url, headers, params, retry_count, **kwargs):
+    async def _parse(self, response, method, url, headers, params, retry_count, span=NOOP_SPAN, **kwargs):
         """
         Parse the response and handle errors.
         
         Args:
-            response: aiohttp response object
+            response: Transport response object
             method: HTTP method used
             url: URL requested
             headers: Request headers
             params: Query parameters
             retry_count: Current retry attempt
+            span: Request span, which gets the number of (decoded) body bytes read
             **kwargs: Additional arguments passed to the request
             
         Returns:
@@ -362,8 +737,13 @@ class Client:
         content_type = response.headers.get("Content-Type", "")
         
         # Check if we should retry based on status code
-        if status_code in self.RETRY_STATUS_CODES and retry_count < self.max_retries and method in self.IDEMPOTENT_METHODS:
-            return await self._retry_request(method, url, headers, params, retry_count, None, **kwargs)
+        if (status_code in self.RETRY_STATUS_CODES and retry_count < self.max_retries
+                and method in self.IDEMPOTENT_METHODS and kwargs.get("retry", True)):
+            raise _RetryableStatus()
+
+        # Counted from the body itself; chunked and compressed responses carry no Content-Length
+        body = await response.read()
+        span.set_attribute("http.response_content_length", len(body))
         
         # Parse response based on content type
         if "application/json" in content_type:
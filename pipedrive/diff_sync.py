@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+from typing import Optional, Dict, Any, Callable, Awaitable, Iterable, Tuple, Union, Mapping
+
+from pipedrive import exceptions
+from pipedrive.batching import bounded_map, BatchResult
+from pipedrive.scheduler import BULK
+
+
+def diff_fields(desired: Mapping[str, Any], current: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Get the fields of ``desired`` whose value differs from ``current``.
+
+    Args:
+        desired: Field values that should be set
+        current: Last known remote values (None when unknown)
+
+    Returns:
+        Mapping of changed field names to their desired values
+    """
+    if current is None:
+        return dict(desired)
+    return {
+        key: value
+        for key, value in desired.items()
+        if key not in current or current[key] != value
+    }
+
+
+class SnapshotStore:
+    """
+    JSON file holding the last known remote state of synced records.
+
+    Only the fields a sync manages are stored, keyed by record id. The file is
+    replaced atomically on save so an interrupted run never corrupts it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the snapshot.
+
+        Args:
+            path: Location of the snapshot file (created on first save)
+        """
+        self.path = path
+        self.records = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.records = json.load(f)
+
+    def get(self, record_id) -> Optional[Dict[str, Any]]:
+        return self.records.get(str(record_id))
+
+    def update(self, record_id, fields: Mapping[str, Any]):
+        self.records.setdefault(str(record_id), {}).update(fields)
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.records, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class SyncResult(BatchResult):
+    """Counters describing a diff sync run."""
+
+    COUNTERS = ("total", "unchanged", "changed", "failed", "fetched", "fields_sent")
+
+
+class DiffSync:
+    """
+    Push desired record state to Pipedrive, sending only fields that changed.
+
+    The remote state to compare against comes from a SnapshotStore written by
+    previous runs; records missing from it are fetched when ``fetch`` is given.
+    Records without differences are skipped entirely and the rest get an update
+    request containing just the changed fields.
+
+    Example:
+        sync = DiffSync(client.deals.update_deal, fetch=client.deals.get_deal,
+                        snapshot="deals.snapshot.json")
+        result = await sync.run({deal_id: {"title": ..., "value": ...}, ...})
+    """
+
+    def __init__(
+        self,
+        update: Callable[..., Awaitable[Any]],
+        fetch: Optional[Callable[..., Awaitable[Any]]] = None,
+        snapshot: Union[str, SnapshotStore, None] = None,
+        concurrency: int = 5,
+    ):
+        """
+        Initialize the sync.
+
+        Args:
+            update: Resource update method, e.g. client.deals.update_deal
+            fetch: Resource get method used when a record is not in the snapshot, e.g. client.deals.get_deal
+            snapshot: Snapshot path or SnapshotStore (None to always fetch)
+            concurrency: Maximum number of requests in flight
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.update = update
+        self.fetch = fetch
+        if isinstance(snapshot, str):
+            snapshot = SnapshotStore(snapshot)
+        self.snapshot = snapshot
+        self.concurrency = concurrency
+
+    async def run(self, records: Union[Mapping[Any, Mapping[str, Any]], Iterable[Tuple[Any, Mapping[str, Any]]]],
+                  dry_run: bool = False) -> SyncResult:
+        """
+        Sync records.
+
+        Args:
+            records: Mapping or iterable of (record_id, desired_fields) pairs
+            dry_run: Compute and count changes without sending updates
+
+        Returns:
+            SyncResult with counts of unchanged, changed and failed records
+        """
+        if isinstance(records, Mapping):
+            records = records.items()
+
+        result = SyncResult()
+
+        def sync_one(item):
+            record_id, desired = item
+            result.total += 1
+            return self._sync_one(record_id, desired, result, dry_run)
+
+        try:
+            async for _ in bounded_map(sync_one, records, self.concurrency):
+                pass
+        finally:
+            if self.snapshot is not None and not dry_run:
+                self.snapshot.save()
+
+        return result
+
+    async def _current_state(self, record_id, result):
+        current = self.snapshot.get(record_id) if self.snapshot is not None else None
+        if current is None and self.fetch is not None:
+            response = await self.fetch(record_id, priority=BULK)
+            current = (response or {}).get("data") if isinstance(response, dict) else None
+            result.fetched += 1
+        return current
+
+    async def _sync_one(self, record_id, desired, result, dry_run):
+        try:
+            current = await self._current_state(record_id, result)
+        except exceptions.ApiError as e:
+            result.failed += 1
+            result.errors[record_id] = e
+            return
+
+        changes = diff_fields(desired, current)
+        if not changes:
+            result.unchanged += 1
+            if self.snapshot is not None and self.snapshot.get(record_id) is None:
+                # Remember fetched state so the next run needs no request at all
+                self.snapshot.update(record_id, {key: current[key] for key in desired})
+            return
+
+        if not dry_run:
+            try:
+                await self.update(record_id, changes, priority=BULK)
+            except exceptions.ApiError as e:
+                result.failed += 1
+                result.errors[record_id] = e
+                return
+            if self.snapshot is not None:
+                self.snapshot.update(record_id, desired)
+
+        result.changed += 1
+        result.fields_sent += len(changes)
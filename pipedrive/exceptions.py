@@ -65,3 +65,8 @@ class ServiceUnavailableError(ApiError):
 
 class UnknownError(ApiError):
     pass
+
+
+class ReplayMissError(BaseError):
+    """Request not found in a replay cassette"""
+    pass
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Optional, Dict, Any, Iterable, List
+
+from pipedrive import exceptions
+from pipedrive.batching import bounded_map, BatchResult
+from pipedrive.scheduler import BULK
+
+
+def entry_key(entry: Dict[str, Any]) -> str:
+    """
+    Get a stable identifier for a flow entry.
+
+    Flow entries are unique per (object type, id); entries without an id fall
+    back to a hash of their content.
+    """
+    data = entry.get("data") or {}
+    if data.get("id") is not None:
+        return "{}:{}".format(entry.get("object"), data["id"])
+    canonical = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FlowStore:
+    """
+    SQLite storage for deal flow entries.
+
+    Flow history is append-only on Pipedrive's side, so entries are stored once
+    and never refetched; ``flow_state`` remembers when each deal was last synced.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS flow_entries (
+            deal_id INTEGER NOT NULL,
+            entry_key TEXT NOT NULL,
+            timestamp TEXT,
+            object TEXT,
+            body TEXT NOT NULL,
+            PRIMARY KEY (deal_id, entry_key)
+        );
+        CREATE INDEX IF NOT EXISTS flow_entries_by_time ON flow_entries (deal_id, timestamp);
+        CREATE TABLE IF NOT EXISTS flow_state (
+            deal_id INTEGER PRIMARY KEY,
+            entries INTEGER NOT NULL,
+            synced_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self.SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def known_keys(self, deal_id) -> set:
+        rows = self._db.execute("SELECT entry_key FROM flow_entries WHERE deal_id = ?", (deal_id,))
+        return {row[0] for row in rows}
+
+    def add(self, deal_id, entries: List[Dict[str, Any]]) -> int:
+        """
+        Store new entries of a deal and mark it synced.
+
+        Returns:
+            Number of entries that were not stored yet
+        """
+        rows = [
+            (
+                deal_id,
+                entry_key(entry),
+                entry.get("timestamp") or (entry.get("data") or {}).get("log_time"),
+                entry.get("object"),
+                json.dumps(entry, separators=(",", ":"), default=str),
+            )
+            for entry in entries
+        ]
+        with self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO flow_entries VALUES (?, ?, ?, ?, ?)", rows)
+            added = self._db.total_changes - before
+            self._db.execute(
+                "INSERT OR REPLACE INTO flow_state VALUES (?, "
+                "(SELECT COUNT(*) FROM flow_entries WHERE deal_id = ?), ?)",
+                (deal_id, deal_id, time.time()),
+            )
+        return added
+
+    def entries(self, deal_id) -> List[Dict[str, Any]]:
+        """Get the stored entries of a deal, newest first."""
+        rows = self._db.execute(
+            "SELECT body FROM flow_entries WHERE deal_id = ? ORDER BY timestamp DESC", (deal_id,)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def synced_at(self, deal_id) -> Optional[float]:
+        row = self._db.execute("SELECT synced_at FROM flow_state WHERE deal_id = ?", (deal_id,)).fetchone()
+        return row[0] if row else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class FlowSyncResult(BatchResult):
+    """Counters describing a flow history sync run."""
+
+    COUNTERS = ("deals", "pages", "new_entries", "failed")
+
+
+class FlowHistory:
+    """
+    Incrementally cached ``deals/{id}/flow`` history for many deals.
+
+    Deals are fetched concurrently and each flow is paged through newest
+    first. Paging for a deal stops at the first page that contains an entry
+    that is already stored, so later runs only download what happened since
+    the previous one.
+
+    Example:
+        with FlowStore("flows.sqlite") as store:
+            history = FlowHistory(client, store)
+            await history.sync(deal_ids)
+            entries = history.entries(deal_id)
+    """
+
+    def __init__(self, client, store: FlowStore, page_size: int = 100, max_in_flight: Optional[int] = None):
+        """
+        Initialize the service.
+
+        Args:
+            client: Client instance
+            store: FlowStore holding already downloaded entries
+            page_size: Number of flow entries per request
+            max_in_flight: Maximum number of deals fetched at once (defaults to concurrency_limit)
+        """
+        self.client = client
+        self.store = store
+        self.page_size = page_size
+        self.max_in_flight = max_in_flight or client.concurrency_limit
+
+    async def sync(self, deal_ids: Iterable[Any], **kwargs) -> FlowSyncResult:
+        """
+        Download flow entries that are not stored yet.
+
+        Args:
+            deal_ids: Deals to sync
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Returns:
+            FlowSyncResult with page and entry counts
+        """
+        kwargs.setdefault("priority", BULK)
+        result = FlowSyncResult()
+        async for _ in bounded_map(lambda deal_id: self._sync_deal(deal_id, result, kwargs), deal_ids,
+                                   self.max_in_flight):
+            pass
+        return result
+
+    async def _sync_deal(self, deal_id, result, kwargs):
+        result.deals += 1
+        known = self.store.known_keys(deal_id)
+        new_entries = []
+        start = 0
+
+        try:
+            while True:
+                params = {"start": start, "limit": self.page_size}
+                response = await self.client.deals.get_deal_updates(deal_id, params=params, **kwargs)
+                result.pages += 1
+
+                entries = (response or {}).get("data") or []
+                reached_known = False
+                for entry in entries:
+                    if entry_key(entry) in known:
+                        reached_known = True
+                        break
+                    new_entries.append(entry)
+
+                pagination = ((response or {}).get("additional_data") or {}).get("pagination") or {}
+                if reached_known or not entries or not pagination.get("more_items_in_collection"):
+                    break
+                start = pagination.get("next_start", start + len(entries))
+        except exceptions.ApiError as e:
+            # Keep nothing from a partial download; the next run starts over for this deal
+            result.failed += 1
+            result.errors[deal_id] = e
+            return
+
+        result.new_entries += self.store.add(deal_id, new_entries)
+
+    def entries(self, deal_id) -> List[Dict[str, Any]]:
+        """Get the stored flow of a deal, newest first."""
+        return self.store.entries(deal_id)
+
+    def flows(self, deal_ids: Iterable[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Get the stored flows of several deals.
+
+        Returns:
+            Mapping of deal id to entries, usable as PipelineAnalytics.from_records' ``flows``
+        """
+        return {deal_id: self.store.entries(deal_id) for deal_id in deal_ids}
@@ -0,0 +1,331 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+
+from pipedrive import exceptions
+from pipedrive.transports import Transport
+
+# Query parameters and headers never written to a cassette
+REDACTED_PARAMS = {"api_token"}
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie", "x-api-token"}
+
+# Headers describing the wire encoding; recorded bodies are stored decoded
+ENCODING_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class _Headers(dict):
+    """Case-insensitive, read-only view of recorded headers."""
+
+    def __init__(self, headers):
+        super().__init__((key.lower(), value) for key, value in headers.items())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+
+class BufferedResponse:
+    """Fully read response implementing the interface documented on Transport."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = _Headers(headers)
+        self.ok = status < 400
+        self.body = body
+
+    def _encoding(self):
+        content_type = self.headers.get("Content-Type", "")
+        for part in content_type.split(";")[1:]:
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value
+        return "utf-8"
+
+    async def read(self):
+        return self.body
+
+    async def text(self):
+        return self.body.decode(self._encoding(), errors="replace")
+
+    async def json(self):
+        return json.loads(self.body.decode(self._encoding()))
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+    """
+    Build the key a request is matched by during replay.
+
+    The key covers the method, URL, query parameters (from both the URL and
+    ``params``, without credentials) and a hash of the JSON/form body.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in REDACTED_PARAMS]
+    query.extend((str(k), str(v)) for k, v in (params or {}).items() if k not in REDACTED_PARAMS)
+    query.sort()
+
+    body = kwargs.get("json", kwargs.get("data"))
+    body_hash = ""
+    if body is not None:
+        canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+        body_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    base = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    return json.dumps([method.upper(), base, query, body_hash], separators=(",", ":"))
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _request_entry(headers: Optional[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+    """Describe the headers and body of a request for a cassette, without credentials."""
+    entry = {
+        "headers": {
+            key: value for key, value in (headers or {}).items() if key.lower() not in REDACTED_HEADERS
+        },
+    }
+    if kwargs.get("json") is not None:
+        entry["json"] = json.loads(json.dumps(kwargs["json"], default=str))
+    elif kwargs.get("data") is not None:
+        data = kwargs["data"]
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if isinstance(data, (bytes, bytearray)):
+            entry.update(_encode_body(bytes(data)))
+        else:
+            entry["data"] = json.loads(json.dumps(data, default=str))
+    return entry
+
+
+def _decode_body(entry: Dict[str, Any]) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    Gzipped JSON Lines file of recorded request/response pairs.
+
+    Each line holds the request key, the request headers and body, the
+    status, response headers and body, and the time the live request took.
+    Credentials are stripped before writing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = []
+
+    def load(self) -> "Cassette":
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        return self
+
+    def append(self, entry: Dict[str, Any]):
+        self.entries.append(entry)
+
+    def save(self):
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that forwards requests to another transport and records them.
+
+    The cassette is written when the transport is closed (i.e. when the
+    Client's context manager exits) or when save() is called.
+
+    Example:
+        transport = RecordingTransport(AiohttpTransport(), "session.cassette.gz")
+        async with Client(api_token, transport=transport) as client:
+            ...
+    """
+
+    def __init__(self, inner: Transport, path: str):
+        """
+        Initialize the transport.
+
+        Args:
+            inner: Transport that performs the real requests
+            path: Cassette file to write
+        """
+        self.inner = inner
+        self.cassette = Cassette(path)
+
+    @property
+    def network_errors(self):
+        return self.inner.network_errors
+
+    def error_class(self, error):
+        return self.inner.error_class(error)
+
+    @property
+    def is_open(self):
+        return self.inner.is_open
+
+    async def open(self):
+        await self.inner.open()
+
+    async def close(self):
+        await self.inner.close()
+        self.save()
+
+    def save(self):
+        self.cassette.save()
+
+    @asynccontextmanager
+    async def request(self, method, url, headers=None, params=None, **kwargs):
+        started = time.monotonic()
+        async with self.inner.request(method, url, headers=headers, params=params, **kwargs) as response:
+            body = await response.read()
+            elapsed = time.monotonic() - started
+            response_headers = {
+                key: value for key, value in response.headers.items()
+                if key.lower() not in REDACTED_HEADERS and key.lower() not in ENCODING_HEADERS
+            }
+
+        entry = {
+            "key": request_key(method, url, params, **kwargs),
+            "request": _request_entry(headers, **kwargs),
+            "status": response.status,
+            "headers": response_headers,
+            "elapsed": round(elapsed, 6),
+        }
+        entry.update(_encode_body(body))
+        self.cassette.append(entry)
+
+        yield BufferedResponse(response.status, response_headers, body)
+
+
+class ReplayTransport(Transport):
+    """
+    Transport that serves responses from a cassette instead of the network.
+
+    Requests are matched by method, URL, query parameters and body. Repeated
+    requests get the recorded responses in order, and the last one is reused
+    once they run out. Optional fault injection makes it usable for load
+    tests of throughput features:
+
+        speed:      replay recorded latency divided by this factor (None for no delay)
+        latency:    extra (min, max) seconds added to every request
+        error_rate: probability of a simulated network failure
+        rate_limit: requests per second allowed before 429 responses are returned
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: Optional[float] = 1.0,
+        latency: Optional[Tuple[float, float]] = None,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            path: Cassette file to read
+            speed: Playback speed factor for recorded latency (None or 0 for instant replies)
+            latency: Extra latency range in seconds added to every request
+            error_rate: Probability (0-1) that a request fails with a simulated connection error
+            rate_limit: Simulated rate limit in requests per second (token bucket, burst of one second
+                or at least one request)
+            seed: Random seed for reproducible fault injection
+        """
+        self.cassette = Cassette(path).load()
+        self.speed = speed
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._open = False
+
+        self._responses = defaultdict(list)
+        for entry in self.cassette.entries:
+            self._responses[entry["key"]].append(entry)
+        self._positions = defaultdict(int)
+
+        # Burst capacity of one second, but at least one request so rates below 1/s can be met
+        self._capacity = max(1.0, rate_limit or 0.0)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "misses": 0}
+
+    @property
+    def is_open(self):
+        return self._open
+
+    async def open(self):
+        self._open = True
+
+    async def close(self):
+        self._open = False
+
+    def _next_entry(self, key):
+        entries = self._responses.get(key)
+        if not entries:
+            return None
+        position = self._positions[key]
+        self._positions[key] = min(position + 1, len(entries) - 1)
+        return entries[position]
+
+    def _take_token(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    @asynccontextmanager
+    async def request(self, method, url, headers=None, params=None, **kwargs):
+        self.stats["requests"] += 1
+
+        delay = 0.0
+        if self.latency:
+            delay += self._random.uniform(*self.latency)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            await asyncio.sleep(delay)
+            raise ConnectionResetError("Simulated connection failure: {}".format(url))
+
+        if self.rate_limit and not self._take_token():
+            self.stats["rate_limited"] += 1
+            await asyncio.sleep(delay)
+            body = json.dumps({"success": False, "error": "Request over limit"}).encode("utf-8")
+            yield BufferedResponse(429, {"Content-Type": "application/json", "Retry-After": "1"}, body)
+            return
+
+        key = request_key(method, url, params, **kwargs)
+        entry = self._next_entry(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            raise exceptions.ReplayMissError("No recorded response for {} {}".format(method.upper(), url), None)
+
+        if self.speed:
+            delay += entry.get("elapsed", 0.0) / self.speed
+        if delay:
+            await asyncio.sleep(delay)
+
+        yield BufferedResponse(entry["status"], entry["headers"], _decode_body(entry))
@@ -0,0 +1,187 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any
+
+# Priority classes, from most to least latency sensitive
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+
+PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+
+# Relative share of free slots each class receives while all classes are backlogged
+DEFAULT_WEIGHTS = {
+    INTERACTIVE: 16,
+    NORMAL: 4,
+    BULK: 1,
+}
+
+
+class _ClassStats:
+    """Counters for a single priority class."""
+
+    # Number of recent wait samples kept for percentile calculation
+    SAMPLE_SIZE = 1024
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.samples = deque(maxlen=self.SAMPLE_SIZE)
+
+    def record_wait(self, wait):
+        self.completed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.samples.append(wait)
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def as_dict(self):
+        return {
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "acquired": self.completed,
+            "avg_wait": self.total_wait / self.completed if self.completed else 0.0,
+            "p50_wait": self.percentile(50),
+            "p99_wait": self.percentile(99),
+            "max_wait": self.max_wait,
+        }
+
+
+class PriorityScheduler:
+    """
+    Concurrency limiter that hands out request slots by priority class.
+
+    Waiting requests are served using weighted fair queuing: every waiter gets a
+    virtual finish tag of ``max(now, last tag of its class) + 1 / weight`` and the
+    waiter with the smallest tag is admitted first. Interactive calls therefore
+    overtake a deep backlog of bulk calls, while bulk work still makes progress
+    in proportion to its weight instead of starving.
+    """
+
+    def __init__(self, limit: int, weights: Optional[Dict[str, int]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limit: Maximum number of slots that may be held at once
+            weights: Relative weight of each priority class (merged with DEFAULT_WEIGHTS)
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        self.limit = limit
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        for priority, weight in self.weights.items():
+            if weight <= 0:
+                raise ValueError("weight for priority '{}' must be positive".format(priority))
+
+        self._active = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_tag = {priority: 0.0 for priority in self.weights}
+        self._stats = {priority: _ClassStats() for priority in self.weights}
+
+    def _check_priority(self, priority):
+        if priority not in self.weights:
+            raise ValueError(
+                "Unknown priority '{}', expected one of: {}".format(priority, ", ".join(self.weights))
+            )
+
+    async def acquire(self, priority: str = NORMAL) -> float:
+        """
+        Wait for a free slot.
+
+        Args:
+            priority: Priority class of the caller
+
+        Returns:
+            Time spent waiting in the queue, in seconds
+        """
+        self._check_priority(priority)
+        stats = self._stats[priority]
+
+        # Fast path: a slot is free and nobody is waiting ahead of us
+        if self._active < self.limit and not self._queue:
+            self._active += 1
+            stats.in_flight += 1
+            stats.record_wait(0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        tag = max(self._virtual_time, self._last_tag[priority]) + 1.0 / self.weights[priority]
+        self._last_tag[priority] = tag
+        heapq.heappush(self._queue, (tag, next(self._sequence), priority, future))
+        stats.queued += 1
+
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # Still queued; _dispatch skips cancelled entries
+                stats.queued -= 1
+            else:
+                # The slot was granted just before cancellation, hand it back
+                self.release(priority)
+            raise
+
+        wait = time.monotonic() - started
+        stats.record_wait(wait)
+        return wait
+
+    def release(self, priority: str = NORMAL):
+        """Return a slot previously obtained with acquire()."""
+        self._active -= 1
+        self._stats[priority].in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._active < self.limit and self._queue:
+            tag, _, priority, future = heapq.heappop(self._queue)
+            if future.cancelled():
+                continue
+            stats = self._stats[priority]
+            stats.queued -= 1
+            stats.in_flight += 1
+            self._active += 1
+            self._virtual_time = tag
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: str = NORMAL):
+        """
+        Hold a slot for the duration of the ``async with`` block.
+
+        Yields:
+            Time spent waiting in the queue, in seconds
+        """
+        wait = await self.acquire(priority)
+        try:
+            yield wait
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and wait-time statistics for each priority class.
+
+        Returns:
+            Mapping of priority class to its statistics
+        """
+        return {priority: stats.as_dict() for priority, stats in self._stats.items()}
@@ -0,0 +1,228 @@
+import importlib
+import json
+import sqlite3
+import time
+from typing import Optional, Dict, Any, Iterable, AsyncIterable, List, Union
+
+from pipedrive import exceptions
+from pipedrive.batching import bounded_map, BatchResult
+from pipedrive.scheduler import BULK
+
+# Columns of the payment table, in order
+PAYMENT_COLUMNS = (
+    "deal_id",
+    "subscription_id",
+    "payment_id",
+    "due_at",
+    "amount",
+    "currency",
+    "payment_type",
+    "is_active",
+)
+
+
+class SubscriptionCache:
+    """
+    SQLite cache of each deal's subscription and its payment schedule.
+
+    Payments are only refetched when the subscription's ``update_time`` changes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS subscriptions (
+            deal_id INTEGER PRIMARY KEY,
+            subscription_id INTEGER,
+            update_time TEXT,
+            payments TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (and if needed create) the cache.
+
+        Args:
+            path: SQLite database file (in-memory by default)
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self.SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def get(self, deal_id) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT subscription_id, update_time, payments, fetched_at FROM subscriptions WHERE deal_id = ?",
+            (deal_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "subscription_id": row[0],
+            "update_time": row[1],
+            "payments": json.loads(row[2]),
+            "fetched_at": row[3],
+        }
+
+    def put(self, deal_id, subscription_id, update_time, payments: List[Dict[str, Any]]):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO subscriptions VALUES (?, ?, ?, ?, ?)",
+                (deal_id, subscription_id, update_time,
+                 json.dumps(payments, separators=(",", ":"), default=str), time.time()),
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PaymentTable:
+    """Flat, column-oriented table of subscription payments."""
+
+    def __init__(self):
+        self.columns = {column: [] for column in PAYMENT_COLUMNS}
+
+    def extend(self, deal_id, subscription_id, payments: List[Dict[str, Any]]):
+        columns = self.columns
+        for payment in payments:
+            columns["deal_id"].append(deal_id)
+            columns["subscription_id"].append(subscription_id)
+            columns["payment_id"].append(payment.get("id"))
+            columns["due_at"].append(payment.get("due_at"))
+            columns["amount"].append(payment.get("amount"))
+            columns["currency"].append(payment.get("currency"))
+            columns["payment_type"].append(payment.get("payment_type"))
+            columns["is_active"].append(payment.get("is_active"))
+
+    def __len__(self):
+        return len(self.columns["deal_id"])
+
+    def rows(self):
+        """Iterate over the payments as dicts."""
+        for values in zip(*(self.columns[column] for column in PAYMENT_COLUMNS)):
+            yield dict(zip(PAYMENT_COLUMNS, values))
+
+    def to_arrow(self):
+        """
+        Export the table as a pyarrow.Table.
+
+        Returns:
+            Table with the PAYMENT_COLUMNS columns
+        """
+        try:
+            pa = importlib.import_module("pyarrow")
+        except ImportError as e:
+            raise ImportError("to_arrow requires pyarrow: pip install pyarrow") from e
+        return pa.table(self.columns)
+
+
+class PaymentLoadResult(BatchResult):
+    """Payments table plus counters describing a load run."""
+
+    COUNTERS = ("deals", "without_subscription", "cached", "fetched", "failed")
+
+    def __init__(self):
+        super().__init__()
+        self.payments = PaymentTable()
+
+    def as_dict(self):
+        counts = super().as_dict()
+        counts["payments"] = len(self.payments)
+        return counts
+
+
+class SubscriptionPaymentLoader:
+    """
+    Load the payment schedules of many deals' subscriptions concurrently.
+
+    For each deal the subscription is resolved with get_deal_subscription. Its
+    payments are fetched with get_all_payments only if the subscription
+    changed since it was cached. Entries younger than ``max_age`` are served
+    from the cache without any request.
+
+    Example:
+        with SubscriptionCache("subscriptions.sqlite") as cache:
+            loader = SubscriptionPaymentLoader(client, cache)
+            result = await loader.load(deal_ids)
+            table = result.payments.columns
+    """
+
+    def __init__(self, client, cache: Optional[SubscriptionCache] = None, max_age: Optional[float] = None,
+                 max_in_flight: Optional[int] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            client: Client instance
+            cache: SubscriptionCache to reuse across runs (in-memory if omitted)
+            max_age: Seconds a cache entry is trusted without checking the subscription (None to always check)
+            max_in_flight: Maximum number of deals processed at once (defaults to concurrency_limit)
+        """
+        self.client = client
+        self.cache = cache if cache is not None else SubscriptionCache()
+        self.max_age = max_age
+        self.max_in_flight = max_in_flight or client.concurrency_limit
+
+    async def load(self, deal_ids: Union[Iterable[Any], AsyncIterable[Any]], **kwargs) -> PaymentLoadResult:
+        """
+        Load the payments of all given deals.
+
+        Args:
+            deal_ids: Iterable or async iterable of deal ids
+            **kwargs: Additional arguments to pass to each request (priority defaults to "bulk")
+
+        Returns:
+            PaymentLoadResult with the payments table and counters
+        """
+        kwargs.setdefault("priority", BULK)
+        result = PaymentLoadResult()
+        async for _ in bounded_map(lambda deal_id: self._load_deal(deal_id, result, kwargs), deal_ids,
+                                   self.max_in_flight):
+            pass
+        return result
+
+    async def _load_deal(self, deal_id, result, kwargs):
+        result.deals += 1
+        cached = self.cache.get(deal_id)
+        if cached is not None and self.max_age is not None and time.time() - cached["fetched_at"] < self.max_age:
+            if cached["subscription_id"] is None:
+                result.without_subscription += 1
+            else:
+                result.cached += 1
+                result.payments.extend(deal_id, cached["subscription_id"], cached["payments"])
+            return
+
+        try:
+            try:
+                response = await self.client.subscriptions.get_deal_subscription(deal_id, **kwargs)
+                subscription = (response or {}).get("data") if isinstance(response, dict) else None
+            except exceptions.NotFoundError:
+                subscription = None
+
+            if not subscription:
+                result.without_subscription += 1
+                self.cache.put(deal_id, None, None, [])
+                return
+
+            subscription_id = subscription.get("id")
+            update_time = subscription.get("update_time")
+            if (cached is not None and cached["subscription_id"] == subscription_id
+                    and cached["update_time"] == update_time):
+                result.cached += 1
+                payments = cached["payments"]
+            else:
+                response = await self.client.subscriptions.get_all_payments(subscription_id, **kwargs)
+                payments = ((response or {}).get("data") if isinstance(response, dict) else None) or []
+                result.fetched += 1
+            self.cache.put(deal_id, subscription_id, update_time, payments)
+        except exceptions.ApiError as e:
+            result.failed += 1
+            result.errors[deal_id] = e
+            return
+
+        result.payments.extend(deal_id, subscription_id, payments)
@@ -0,0 +1,227 @@
+import contextvars
+import importlib
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlsplit
+
+# Path segments replaced by "{id}" in endpoint templates: numbers, UUIDs and hex ids
+_ID_SEGMENT = re.compile(
+    r"^(\d+"
+    r"|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{24,})$"
+)
+
+_current_span = contextvars.ContextVar("pipedrive_current_span", default=None)
+
+
+def endpoint_template(url: str, base_url: str = "") -> str:
+    """
+    Reduce a request URL to its endpoint template.
+
+    The base URL, query string (which carries the api_token) and object ids are
+    removed, e.g. ``https://.../api/v2/deals/42/flow?api_token=...`` becomes
+    ``deals/{id}/flow``.
+
+    Args:
+        url: Request URL
+        base_url: Client base URL to strip
+
+    Returns:
+        Endpoint template
+    """
+    if base_url and url.startswith(base_url):
+        path = url[len(base_url):]
+    else:
+        path = urlsplit(url).path
+    path = path.split("?", 1)[0].strip("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class Span:
+    """A timed operation with attributes, compatible with the OpenTelemetry span data model."""
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else "{:032x}".format(random.getrandbits(128))
+        self.span_id = "{:016x}".format(random.getrandbits(64))
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = "UNSET"
+        self.start_time = time.time_ns()
+        self.end_time = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.events.append({"name": name, "time": time.time_ns(), "attributes": dict(attributes or {})})
+
+    def record_exception(self, exception: BaseException):
+        self.status = "ERROR"
+        self.add_event("exception", {
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception),
+        })
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, None while the span is open."""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
+
+    def __repr__(self):
+        return "Span({!r}, duration={}, attributes={})".format(self.name, self.duration, self.attributes)
+
+
+class _NoopSpan:
+    """Span stand-in used while tracing is disabled."""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, attributes=None):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class InMemoryExporter:
+    """Collects finished spans in a list; intended for tests and local analysis."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def clear(self):
+        self.spans = []
+
+    def find(self, name: str) -> List[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to an exporter.
+
+    The current span is tracked in a context variable, so spans started inside
+    tasks created by paginate/batch_get are parented to the batch span.
+    """
+
+    def __init__(self, exporter=None):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Object with an ``export(span)`` method (defaults to an InMemoryExporter)
+        """
+        self.exporter = exporter if exporter is not None else InMemoryExporter()
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Run the block inside a new span, parented to the current span.
+
+        Yields:
+            The Span, to add attributes to
+        """
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """
+        Start a span without making it current; finish it with end_span().
+
+        Useful for async generators, which must not leave context variables set between yields.
+        """
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, span: Span):
+        span.end_time = time.time_ns()
+        if span.status == "UNSET":
+            span.status = "OK"
+        self.exporter.export(span)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def attach(self, span: Optional[Span]):
+        """
+        Make ``span`` the current span of the running context.
+
+        Returns:
+            Token for detach()
+        """
+        return _current_span.set(span)
+
+    def detach(self, token):
+        _current_span.reset(token)
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer that emits spans through the OpenTelemetry API.
+
+    Spans go to whatever TracerProvider the application configured, and
+    propagate with OpenTelemetry's own context. Requires ``opentelemetry-api``.
+    """
+
+    def __init__(self, tracer_provider=None):
+        """
+        Initialize the tracer.
+
+        Args:
+            tracer_provider: OpenTelemetry TracerProvider (defaults to the global provider)
+        """
+        try:
+            trace = importlib.import_module("opentelemetry.trace")
+        except ImportError as e:
+            raise ImportError("OpenTelemetryTracer requires opentelemetry-api") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer("pipedrive", tracer_provider=tracer_provider)
+        self.exporter = None
+
+    @contextmanager
+    def span(self, name, attributes=None):
+        with self._tracer.start_as_current_span(name, attributes=attributes or {}) as span:
+            yield span
+
+    def start_span(self, name, attributes=None):
+        return self._tracer.start_span(name, attributes=attributes or {})
+
+    def end_span(self, span):
+        span.end()
+
+    def current_span(self):
+        return self._trace.get_current_span()
+
+    def attach(self, span):
+        context = importlib.import_module("opentelemetry.context")
+        return context.attach(self._trace.set_span_in_context(span))
+
+    def detach(self, token):
+        importlib.import_module("opentelemetry.context").detach(token)
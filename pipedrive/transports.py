@@ -0,0 +1,288 @@
+import asyncio
+import importlib
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Tuple, Union
+
+from pipedrive import exceptions
+
+DEFAULT_HEADERS = {
+    "User-Agent": "pipedrive-python/1.0",
+    "Accept": "application/json",
+}
+
+
+class Transport:
+    """
+    Base class for the HTTP backends used by Client.
+
+    ``request`` is an async context manager yielding a response object with:
+
+        status:  HTTP status code
+        headers: Case-insensitive mapping of response headers
+        ok:      True for status codes below 400
+        json():  Coroutine returning the decoded JSON body
+        text():  Coroutine returning the body as text
+        read():  Coroutine returning the raw body as bytes
+
+    Network failures must be raised as one of ``network_errors`` so Client can
+    retry them; ``error_class`` maps such an error to the exception Client
+    raises once retries are exhausted.
+    """
+
+    # Exception types that represent network-level failures
+    network_errors: Tuple[type, ...] = (asyncio.TimeoutError, OSError)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the transport is ready to send requests."""
+        raise NotImplementedError
+
+    async def open(self):
+        """Allocate connections/sessions. Called by Client before the first request."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release connections/sessions."""
+        raise NotImplementedError
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                params: Optional[Dict[str, Any]] = None, **kwargs):
+        """Send a request; must be used as ``async with transport.request(...) as response``."""
+        raise NotImplementedError
+
+    async def iter_content(self, response, chunk_size: int = 65536):
+        """
+        Iterate over the (decompressed) response body in chunks.
+
+        The default implementation reads the whole body at once; transports
+        should override it to stream from the socket.
+        """
+        yield await response.read()
+
+    def error_class(self, error: BaseException) -> type:
+        """
+        Map a network error to the exception raised once retries are exhausted.
+
+        Args:
+            error: Exception that is an instance of one of ``network_errors``
+
+        Returns:
+            exceptions.TimeoutError, exceptions.ConnectionError or exceptions.ApiError
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return exceptions.TimeoutError
+        if isinstance(error, OSError):
+            return exceptions.ConnectionError
+        return exceptions.ApiError
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 transport backed by a pooled aiohttp.ClientSession (the default)."""
+
+    def __init__(
+        self,
+        timeout: Union[int, float, Tuple[int, int]] = 30,
+        limit: Optional[int] = 100,
+        limit_per_host: Optional[int] = 0,
+        headers: Optional[Dict[str, str]] = None,
+        compress: bool = True,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Total request timeout in seconds
+            limit: Maximum number of connections (overall)
+            limit_per_host: Maximum number of connections per host (0 means no limit)
+            headers: Default headers sent with every request
+            compress: Advertise every content coding aiohttp can decode (aiohttp's default
+                Accept-Encoding); False requests uncompressed responses
+        """
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.compress = compress
+        self.session = None
+        self._aiohttp = None
+
+    @property
+    def network_errors(self):
+        aiohttp = self._import()
+        return (aiohttp.ClientError, asyncio.TimeoutError)
+
+    def _import(self):
+        # aiohttp is imported on first use to keep `import pipedrive` cheap
+        if self._aiohttp is None:
+            self._aiohttp = importlib.import_module("aiohttp")
+        return self._aiohttp
+
+    @property
+    def is_open(self):
+        return self.session is not None and not self.session.closed
+
+    async def open(self):
+        aiohttp = self._import()
+
+        # aiohttp builds Accept-Encoding from the decoders it can actually use
+        headers = dict(self.headers)
+        if not self.compress:
+            headers.setdefault("Accept-Encoding", "identity")
+
+        # Create a TCP connector with connection pooling
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            enable_cleanup_closed=True,
+        )
+
+        # Create the client session with default headers and timeout
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=headers,
+        )
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def request(self, method, url, headers=None, params=None, **kwargs):
+        return self.session.request(method, url, headers=headers, params=params, **kwargs)
+
+    async def iter_content(self, response, chunk_size=65536):
+        async for chunk in response.content.iter_chunked(chunk_size):
+            yield chunk
+
+    def error_class(self, error):
+        aiohttp = self._import()
+        if isinstance(error, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+            return exceptions.TimeoutError
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return exceptions.ConnectionError
+        return exceptions.ApiError
+
+
+class _HttpxResponse:
+    """Adapt an httpx.Response to the response interface documented on Transport."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.ok = response.status_code < 400
+
+    async def read(self):
+        return await self._response.aread()
+
+    async def json(self):
+        await self._response.aread()
+        return self._response.json()
+
+    async def text(self):
+        await self._response.aread()
+        return self._response.text
+
+    async def iter_chunked(self, chunk_size):
+        async for chunk in self._response.aiter_bytes(chunk_size):
+            yield chunk
+
+
+class HttpxTransport(Transport):
+    """
+    Transport backed by httpx, with optional HTTP/2.
+
+    With ``http2=True`` concurrent requests are multiplexed as streams over a
+    handful of connections instead of each needing its own TCP+TLS connection.
+    Requires ``pip install httpx[http2]``. httpx sets Accept-Encoding itself from
+    the decoders it has available (gzip, deflate, br, zstd).
+    """
+
+    def __init__(
+        self,
+        timeout: Union[int, float, Tuple[int, int]] = 30,
+        http2: bool = True,
+        max_connections: Optional[int] = 10,
+        max_keepalive_connections: Optional[int] = 10,
+        headers: Optional[Dict[str, str]] = None,
+        verify: Any = True,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Request timeout in seconds (can be a tuple of (connect_timeout, read_timeout))
+            http2: Negotiate HTTP/2 with servers that support it
+            max_connections: Maximum number of connections (overall)
+            max_keepalive_connections: Maximum number of idle connections kept open
+            headers: Default headers sent with every request
+            verify: TLS verification setting passed to httpx (True, False or an SSL context)
+        """
+        self.timeout = timeout
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.verify = verify
+        self.client = None
+        self._httpx = None
+
+    def _import(self):
+        if self._httpx is None:
+            try:
+                self._httpx = importlib.import_module("httpx")
+            except ImportError as e:
+                raise ImportError("HttpxTransport requires httpx: pip install httpx[http2]") from e
+        return self._httpx
+
+    @property
+    def network_errors(self):
+        httpx = self._import()
+        return (httpx.TransportError, asyncio.TimeoutError)
+
+    @property
+    def is_open(self):
+        return self.client is not None and not self.client.is_closed
+
+    async def open(self):
+        httpx = self._import()
+
+        if isinstance(self.timeout, tuple):
+            connect_timeout, read_timeout = self.timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            timeout = httpx.Timeout(self.timeout)
+
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+            headers=self.headers,
+            verify=self.verify,
+        )
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    @asynccontextmanager
+    async def request(self, method, url, headers=None, params=None, **kwargs):
+        async with self.client.stream(method, url, headers=headers, params=params, **kwargs) as response:
+            yield _HttpxResponse(response)
+
+    async def iter_content(self, response, chunk_size=65536):
+        async for chunk in response.iter_chunked(chunk_size):
+            yield chunk
+
+    def error_class(self, error):
+        httpx = self._import()
+        if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+            return exceptions.TimeoutError
+        if isinstance(error, httpx.ConnectError):
+            return exceptions.ConnectionError
+        return exceptions.ApiError
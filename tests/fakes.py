@@ -0,0 +1,58 @@
+import json
+from contextlib import asynccontextmanager
+
+from pipedrive.transports import Transport
+
+
+class FakeResponse:
+    """In-memory response implementing the interface documented on Transport."""
+
+    def __init__(self, status=200, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = {"Content-Type": "application/json"}
+        self.headers.update(headers or {})
+        self.ok = status < 400
+
+    async def json(self):
+        return self.body
+
+    async def text(self):
+        return json.dumps(self.body)
+
+    async def read(self):
+        return json.dumps(self.body).encode("utf-8")
+
+
+class FakeTransport(Transport):
+    """
+    Transport that answers requests with ``handler(method, url, params, kwargs)``.
+
+    The handler returns a FakeResponse, or an exception to raise as a network error.
+    It may also be a coroutine function. Every request is recorded in ``calls``.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self.opened = False
+
+    @property
+    def is_open(self):
+        return self.opened
+
+    async def open(self):
+        self.opened = True
+
+    async def close(self):
+        self.opened = False
+
+    @asynccontextmanager
+    async def request(self, method, url, headers=None, params=None, **kwargs):
+        self.calls.append((method, url, dict(params or {}), kwargs))
+        response = self.handler(method, url, params or {}, kwargs)
+        if hasattr(response, "__await__"):
+            response = await response
+        if isinstance(response, BaseException):
+            raise response
+        yield response
@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+
+import pytest
+
+from pipedrive import Client, ActivityWindow
+from pipedrive.activity_sync import time_shards
+from tests.fakes import FakeResponse, FakeTransport
+
+UTC = datetime.timezone.utc
+
+
+class ActivityServer:
+    """Serves the v2 activities list: owner_id, ids and update time filters, cursor pagination."""
+
+    def __init__(self, activities):
+        self.activities = activities
+
+    def __call__(self, method, url, params, kwargs):
+        assert url.endswith("/api/v2/activities")
+        assert set(params) <= {"api_token", "owner_id", "ids", "updated_since", "updated_until", "limit", "cursor"}
+        ids = params["ids"].split(",") if "ids" in params else None
+        matches = [
+            activity for activity in self.activities
+            if activity["owner_id"] == params.get("owner_id", activity["owner_id"])
+            and (ids is None or str(activity["id"]) in ids)
+            and params.get("updated_since", "") <= activity["update_time"]
+            and activity["update_time"] < params.get("updated_until", "9999")
+        ]
+        offset = int(params.get("cursor", 0))
+        limit = int(params["limit"])
+        next_cursor = str(offset + limit) if offset + limit < len(matches) else None
+        return FakeResponse(200, {"data": matches[offset:offset + limit], "additional_data": {"next_cursor": next_cursor}})
+
+
+def activity(activity_id, owner_id, due_date, update_time, **fields):
+    return dict(id=activity_id, owner_id=owner_id, due_date=due_date, update_time=update_time, **fields)
+
+
+def run(server, scenario):
+    transport = FakeTransport(server)
+
+    async def main():
+        async with Client("token", transport=transport) as client:
+            return await scenario(client)
+
+    return transport, asyncio.run(main())
+
+
+def test_time_shards_cover_all_update_times():
+    start = datetime.datetime(2024, 6, 1, tzinfo=UTC)
+    shards = list(time_shards(start, start + datetime.timedelta(days=2, hours=1), datetime.timedelta(days=1)))
+    assert shards == [
+        (None, start),
+        (start, start + datetime.timedelta(days=1)),
+        (start + datetime.timedelta(days=1), start + datetime.timedelta(days=2)),
+        (start + datetime.timedelta(days=2), None),
+    ]
+    assert list(time_shards(start, start, datetime.timedelta(days=1))) == [(None, None)]
+
+
+def test_sync_fetches_every_page_of_every_shard_and_filters_by_due_date():
+    today = datetime.datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    server = ActivityServer(
+        [activity(i, 1, "2024-06-10", "2024-05-01T10:00:00Z") for i in range(5)]  # before history_start
+        + [activity(10, 1, "2024-06-11", today), activity(11, 2, "2024-06-12", "2024-06-02T08:00:00Z")]
+        + [activity(12, 2, "2024-07-15", "2024-06-02T09:00:00Z")]  # due outside the window
+        + [activity(13, 2, "2024-06-12", "2024-06-02T10:00:00Z", is_deleted=True)]
+        + [activity(14, 3, "2024-06-12", "2024-06-02T10:00:00Z")]  # owner not synced
+    )
+
+    async def scenario(client):
+        window = ActivityWindow(client, "2024-06-01", "2024-06-30", [1, 2], shard="week",
+                                history_start=datetime.date.today() - datetime.timedelta(days=14), page_size=2)
+        return window, await window.sync()
+
+    transport, (window, result) = run(server, scenario)
+    assert result.failed == 0
+    assert sorted(window.activities) == [0, 1, 2, 3, 4, 10, 11]
+    assert [a["id"] for a in window.for_user(2)] == [11]
+    assert result.added == 7 and result.fetched == 9
+    # One unbounded history shard plus two or three weekly shards per owner
+    assert result.shards in (6, 8)
+    assert all(params["owner_id"] in (1, 2) for _, _, params, _ in transport.calls)
+    assert any("cursor" in params for _, _, params, _ in transport.calls)
+
+
+def test_refresh_applies_changes_since_last_sync():
+    server = ActivityServer([activity(1, 7, "2024-06-03", "2024-06-01T00:00:00Z")])
+
+    async def scenario(client):
+        window = ActivityWindow(client, "2024-06-01", "2024-06-30", [7], history_start="2099-01-01")
+        await window.sync()
+        now = datetime.datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        server.activities = [
+            activity(1, 7, "2024-08-01", now),  # moved out of the window
+            activity(2, 7, "2024-06-05", now),
+        ]
+        return window, await window.refresh()
+
+    transport, (window, result) = run(server, scenario)
+    assert sorted(window.activities) == [2]
+    assert (result.shards, result.added, result.removed) == (2, 1, 1)
+    assert "updated_since" in transport.calls[-1][2]
+
+
+def test_failed_shard_keeps_previous_activities():
+    server = ActivityServer([activity(1, 7, "2024-06-03", "2024-06-01T00:00:00Z")])
+
+    async def scenario(client):
+        window = ActivityWindow(client, "2024-06-01", "2024-06-30", [7], history_start="2099-01-01")
+        await window.sync()
+        transport.handler = lambda *args: FakeResponse(500, {"success": False, "error": "boom"})
+        client.max_retries = 0
+        return window, await window.sync()
+
+    transport = FakeTransport(server)
+
+    async def main():
+        async with Client("token", transport=transport) as client:
+            return await scenario(client)
+
+    window, result = asyncio.run(main())
+    assert result.failed == 1
+    assert list(result.errors) == [(7, None)]
+    assert sorted(window.activities) == [1]
+
+
+def test_shard_size_must_be_positive():
+    start = datetime.datetime(2024, 6, 1, tzinfo=UTC)
+    with pytest.raises(ValueError):
+        time_shards(start, start, datetime.timedelta(0))
+
+
+def test_future_window_is_sharded_by_update_time():
+    today = datetime.date.today()
+    updated = (datetime.datetime.now(UTC) - datetime.timedelta(days=20)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    start, end = today + datetime.timedelta(days=30), today + datetime.timedelta(days=60)
+    server = ActivityServer([activity(1, 7, start.isoformat(), updated), activity(2, 8, end.isoformat(), updated)])
+
+    async def scenario(client):
+        window = ActivityWindow(client, start, end, [7, 8], shard="week")
+        return window, await window.sync()
+
+    transport, (window, result) = run(server, scenario)
+    assert sorted(window.activities) == [1, 2]
+    # HISTORY before today, in weeks, plus the open-ended first and last shard, for each owner
+    weeks = -(-ActivityWindow.HISTORY.days // 7)
+    assert result.shards == 2 * (weeks + 1)
+    unbounded = [params for _, _, params, _ in transport.calls if "updated_since" not in params]
+    assert len(unbounded) == 2 and all("updated_until" in params for params in unbounded)
+
+
+def test_refresh_drops_activities_reassigned_to_other_owners():
+    server = ActivityServer([activity(i, 7, "2024-06-03", "2024-06-01T00:00:00Z") for i in range(1, 4)])
+
+    async def scenario(client):
+        window = ActivityWindow(client, "2024-06-01", "2024-06-30", [7], history_start="2099-01-01")
+        await window.sync()
+        window.IDS_PER_REQUEST = 2
+        now = datetime.datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        server.activities[1] = activity(2, 99, "2024-06-03", now)
+        return window, await window.refresh()
+
+    transport, (window, result) = run(server, scenario)
+    assert sorted(window.activities) == [1, 3]
+    assert result.removed == 1
+    assert sorted(params["ids"] for _, _, params, _ in transport.calls if "ids" in params) == ["1,2", "3"]
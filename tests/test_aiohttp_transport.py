@@ -0,0 +1,62 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.compression_utils import HAS_BROTLI, HAS_ZSTD
+
+from pipedrive import Client, AiohttpTransport
+
+
+def run_against_server(scenario, **transport_kwargs):
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get("Accept-Encoding"))
+        body = json.dumps({"success": True, "data": [{"id": 1}, {"id": 2}]}).encode("utf-8")
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            return web.Response(body=gzip.compress(body), content_type="application/json",
+                                headers={"Content-Encoding": "gzip"})
+        return web.Response(body=body, content_type="application/json")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/v2/deals", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            async with Client("token", domain="http://127.0.0.1:{}".format(port),
+                              transport=AiohttpTransport(**transport_kwargs)) as client:
+                return await scenario(client)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main()), seen
+
+
+async def _fetch_both(client):
+    url = client.BASE_URL + "deals"
+    streamed = [item async for item in client.stream_items(url)]
+    return streamed, await client._get(url)
+
+
+def test_advertises_only_codings_aiohttp_can_decode():
+    (streamed, response), seen = run_against_server(_fetch_both)
+    assert streamed == response["data"] == [{"id": 1}, {"id": 2}]
+
+    codings = {coding.strip() for coding in seen[0].split(",")}
+    assert {"gzip", "deflate"} <= codings
+    assert ("br" in codings) == HAS_BROTLI
+    assert ("zstd" in codings) == HAS_ZSTD
+
+
+def test_compress_disabled_requests_identity():
+    (streamed, response), seen = run_against_server(_fetch_both, compress=False)
+    assert streamed == response["data"]
+    assert seen == ["identity", "identity"]
@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pipedrive.analytics import PipelineAnalytics, _later_max
+
+STAGES = [
+    {"id": 1, "pipeline_id": 1, "order_nr": 1, "deal_probability": 10},
+    {"id": 2, "pipeline_id": 1, "order_nr": 2, "deal_probability": 50},
+    {"id": 3, "pipeline_id": 1, "order_nr": 3, "deal_probability": 90},
+]
+
+AS_OF = 1_700_000_000.0
+
+
+def stage_change(old, new, log_time):
+    return {"object": "dealChange", "data": {"field_key": "stage_id", "old_value": old, "new_value": new,
+                                             "log_time": log_time}}
+
+
+def deal(deal_id, stage_id, add_time="2024-01-01 00:00:00", **fields):
+    record = {"id": deal_id, "stage_id": stage_id, "value": 100, "status": "open", "add_time": add_time}
+    record.update(fields)
+    return record
+
+
+def test_later_max_within_runs():
+    keys = np.array([1, 1, 1, 2, 2, 3])
+    values = np.array([3, 1, 2, 5, 4, 7])
+    low = np.iinfo("int64").min
+    assert _later_max(np, keys, values).tolist() == [2, 2, low, 4, low, low]
+
+
+def test_forward_move_converts():
+    analytics = PipelineAnalytics.from_records(
+        [deal(1, 3)], {1: [stage_change(1, 3, "2024-01-02 00:00:00")]}, STAGES, as_of=AS_OF)
+    conversion = analytics.stage_conversion()
+    assert conversion[1] == {"entered": 1, "converted": 1, "rate": 1.0}
+    assert conversion[3] == {"entered": 1, "converted": 0, "rate": 0.0}
+
+
+def test_backward_move_does_not_convert_the_later_stage():
+    analytics = PipelineAnalytics.from_records(
+        [deal(1, 1)], {1: [stage_change(3, 1, "2024-01-02 00:00:00")]}, STAGES, as_of=AS_OF)
+    conversion = analytics.stage_conversion()
+    # Started in stage 3 and moved back to 1: neither stage was followed by a higher one
+    assert conversion[3] == {"entered": 1, "converted": 0, "rate": 0.0}
+    assert conversion[1] == {"entered": 1, "converted": 0, "rate": 0.0}
+
+
+def test_reentered_stage_converts_if_any_entry_moved_on():
+    flows = {1: [
+        stage_change(1, 2, "2024-01-02 00:00:00"),
+        stage_change(2, 1, "2024-01-03 00:00:00"),
+    ]}
+    analytics = PipelineAnalytics.from_records([deal(1, 1)], flows, STAGES, as_of=AS_OF)
+    conversion = analytics.stage_conversion()
+    assert conversion[1]["converted"] == 1
+    assert conversion[2]["converted"] == 0
+
+
+def test_won_deal_converts_every_stage():
+    analytics = PipelineAnalytics.from_records(
+        [deal(1, 2, status="won", close_time="2024-01-05 00:00:00")],
+        {1: [stage_change(2, 1, "2024-01-02 00:00:00"), stage_change(1, 2, "2024-01-03 00:00:00")]},
+        STAGES, as_of=AS_OF)
+    conversion = analytics.stage_conversion()
+    assert conversion[1]["rate"] == 1.0 and conversion[2]["rate"] == 1.0
+
+
+@pytest.mark.parametrize("log_time", [
+    "2024-01-02 00:00:00",
+    "2024-01-02T00:00:00Z",
+    "2024-01-02T02:00:00+02:00",
+    "2024-01-01T19:00:00-05:00",
+])
+def test_time_in_stage_normalises_offsets(log_time):
+    analytics = PipelineAnalytics.from_records(
+        [deal(1, 2, add_time="2024-01-01T00:00:00Z", status="won", close_time="2024-01-03 00:00:00")],
+        {1: [stage_change(1, 2, log_time)]}, STAGES, as_of=AS_OF)
+    time_in_stage = analytics.time_in_stage()
+    assert time_in_stage[1]["total"] == 86400.0
+    assert time_in_stage[2]["total"] == 86400.0
+
+
+def test_flows_of_unknown_deals_are_ignored():
+    flows = {
+        1: [stage_change(1, 2, "2024-01-02 00:00:00")],
+        99: [stage_change(1, 3, "2024-01-02 00:00:00")],
+    }
+    analytics = PipelineAnalytics.from_records([deal(1, 2)], flows, STAGES, as_of=AS_OF)
+    assert analytics.stage_conversion()[3]["entered"] == 0
+    assert set(analytics.visits["deal_id"].tolist()) == {1}
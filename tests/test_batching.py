@@ -0,0 +1,160 @@
+import asyncio
+import gc
+
+import pytest
+
+from pipedrive import Client
+from pipedrive.batching import bounded_map, BatchResult
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Probe:
+    """Coroutine function that records how many calls run at once."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active = 0
+        self.max_active = 0
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, item):
+        self.started.append(item)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(item, 0.001))
+        except asyncio.CancelledError:
+            self.cancelled.append(item)
+            raise
+        finally:
+            self.active -= 1
+        if item == "boom":
+            raise RuntimeError(item)
+        return item * 10
+
+
+async def collect(agen):
+    return [pair async for pair in agen]
+
+
+def test_limit_is_respected():
+    probe = Probe()
+    results = run(collect(bounded_map(probe, range(20), 3)))
+    assert probe.max_active == 3
+    assert sorted(results) == [(i, i * 10) for i in range(20)]
+
+
+def test_ordered_results_follow_input():
+    probe = Probe({0: 0.03, 1: 0.02})
+    results = run(collect(bounded_map(probe, range(5), 5, ordered=True)))
+    assert results == [(i, i * 10) for i in range(5)]
+
+
+def test_async_source_is_pulled_lazily():
+    pulled = []
+
+    async def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    async def main():
+        async for index, _ in bounded_map(Probe(), source(), 2):
+            if index == 3:
+                break
+        return list(pulled)
+
+    assert len(run(main())) <= 6
+
+
+def test_early_stop_cancels_pending_calls():
+    probe = Probe({1: 1.0, 2: 1.0})
+
+    async def main():
+        agen = bounded_map(probe, range(3), 3)
+        async for _ in agen:
+            break
+        await agen.aclose()
+        await asyncio.sleep(0)
+
+    run(main())
+    assert sorted(probe.cancelled) == [1, 2]
+
+
+def test_exceptions_raise_or_are_returned():
+    with pytest.raises(RuntimeError):
+        run(collect(bounded_map(Probe(), [1, "boom", 2], 1)))
+
+    results = dict(run(collect(bounded_map(Probe(), [1, "boom", 2], 1, return_exceptions=True))))
+    assert isinstance(results[1], RuntimeError)
+    assert results[0] == 10 and results[2] == 20
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        run(collect(bounded_map(Probe(), [1], 0)))
+
+
+def test_batch_result_counters():
+    class ExampleResult(BatchResult):
+        COUNTERS = ("total", "failed")
+
+    result = ExampleResult()
+    result.total += 2
+    assert result.as_dict() == {"total": 2, "failed": 0}
+    assert repr(result) == "ExampleResult(total=2, failed=0)"
+    assert result.errors == {}
+
+
+def test_batch_get_stream_returns_errors_in_order():
+    def handler(method, url, params, kwargs):
+        if url.endswith("/2"):
+            return FakeResponse(404, {"success": False, "error": "not found"})
+        return FakeResponse(200, {"data": {"url": url}})
+
+    async def main():
+        async with Client("token", transport=FakeTransport(handler)) as client:
+            urls = [client.BASE_URL + "deals/{}".format(i) for i in range(5)]
+            return [pair async for pair in client.batch_get_stream(urls, max_in_flight=2, ordered=True)]
+
+    results = run(main())
+    assert [index for index, _ in results] == list(range(5))
+    assert isinstance(results[2][1], Exception)
+    assert results[4][1]["data"]["url"].endswith("/4")
+
+
+def test_failures_finishing_together_are_all_retrieved():
+    reported = []
+
+    async def fail(item):
+        await asyncio.sleep(0.001)
+        raise RuntimeError(item)
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: reported.append(context))
+        try:
+            await collect(bounded_map(fail, range(4), 4))
+        except RuntimeError:
+            # Drop the traceback, which keeps the finished tasks alive
+            return True
+
+    assert run(main())
+    gc.collect()
+    assert reported == []
+
+
+def test_error_waits_for_cancelled_calls():
+    probe = Probe({1: 1.0, 2: 1.0, "boom": 0.001})
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await collect(bounded_map(probe, ["boom", 1, 2], 3))
+        return probe.active
+
+    assert run(main()) == 0
+    assert sorted(probe.cancelled) == [1, 2]
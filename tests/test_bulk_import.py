@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from pipedrive import Client, BulkImporter, ImportJournal, exceptions
+
+KEY_FIELD = "import_key"
+
+
+class PersonServer:
+    """Stores created persons; ``failure`` decides how the create response is lost."""
+
+    def __init__(self, failure):
+        self.failure = failure
+        self.persons = []
+
+    async def create(self, request):
+        payload = await request.json()
+        self.persons.append(payload)
+        person_id = len(self.persons)
+
+        if self.failure == "disconnect":
+            # The person exists, but the client never sees a response
+            request.transport.close()
+            return web.Response()
+        if isinstance(self.failure, int):
+            status, self.failure = self.failure, None
+            return web.json_response({"success": False, "error": "failed"}, status=status)
+        return web.json_response({"success": True, "data": {"id": person_id}})
+
+    async def search(self, request):
+        if request.query.get("fields") not in (None, "custom_fields", "email", "notes", "phone", "name"):
+            return web.json_response({"success": False, "error": "Invalid fields"}, status=400)
+        term = request.query["term"]
+        items = [{"item": {"id": i + 1}} for i, person in enumerate(self.persons) if person.get(KEY_FIELD) == term]
+        return web.json_response({"success": True, "data": {"items": items}})
+
+
+def import_twice(tmp_path, failure, records):
+    server = PersonServer(failure)
+    journal = str(tmp_path / "persons.journal")
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/api/v2/persons", server.create)
+        app.router.add_get("/api/v2/persons/search", server.search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        results = []
+        try:
+            for _ in range(2):
+                async with Client("token", domain="http://127.0.0.1:{}".format(port)) as client:
+                    importer = BulkImporter(
+                        client.persons.create_person, ImportJournal(journal, fsync=False), key_field=KEY_FIELD,
+                        lookup=BulkImporter.search_lookup(client.persons.search_persons),
+                    )
+                    results.append(await importer.run(records))
+                if failure == "disconnect":
+                    server.failure = None
+        finally:
+            await runner.cleanup()
+        return results
+
+    return server, asyncio.run(main())
+
+
+@pytest.mark.parametrize("failure", ["disconnect", 500, 502, 503, 504, 408])
+def test_lost_response_is_recovered_not_duplicated(tmp_path, failure):
+    server, (first, second) = import_twice(tmp_path, failure, [{"name": "Ada"}])
+    assert len(server.persons) == 1
+    assert first.recovered == 1 and first.failed == 0
+    assert second.skipped == 1 and second.created == 0
+
+
+def test_definite_rejection_is_retried_on_next_run(tmp_path):
+    server, (first, second) = import_twice(tmp_path, 400, [{"name": "Ada"}])
+    # The rejected request was stored by the fake server, but a 400 means Pipedrive did not create it
+    assert first.failed == 1 and first.recovered == 0
+    assert second.created == 1
+
+
+def test_in_doubt_without_lookup_is_never_resubmitted(tmp_path):
+    journal = str(tmp_path / "persons.journal")
+    calls = []
+
+    async def create(payload, **kwargs):
+        calls.append(payload)
+        raise exceptions.ConnectionError("Connection error", None)
+
+    async def main():
+        results = []
+        for _ in range(2):
+            importer = BulkImporter(create, ImportJournal(journal, fsync=False))
+            results.append(await importer.run([{"name": "Ada"}]))
+        return results
+
+    first, second = asyncio.run(main())
+    assert first.in_doubt == 1 and second.in_doubt == 1
+    assert len(calls) == 1
+
+
+def test_search_lookup_requires_key_field(tmp_path):
+    async def search(params=None, **kwargs):
+        return None
+
+    with pytest.raises(ValueError):
+        BulkImporter(search, str(tmp_path / "persons.journal"), lookup=BulkImporter.search_lookup(search))
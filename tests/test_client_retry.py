@@ -0,0 +1,58 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from pipedrive import Client, exceptions
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_client(handler, **kwargs):
+    client = Client("token", transport=FakeTransport(handler), **kwargs)
+    client.MIN_RETRY_DELAY = 0.001
+    return client
+
+
+def test_saturated_client_retries_without_deadlock():
+    attempts = Counter()
+
+    async def handler(method, url, params, kwargs):
+        # Keep every slot busy while the first responses come back as 429
+        await asyncio.sleep(0.01)
+        attempts[url] += 1
+        if attempts[url] == 1:
+            return FakeResponse(429, {"success": False, "error": "Request over limit"})
+        return FakeResponse(200, {"success": True, "data": {"url": url}})
+
+    async def main():
+        async with make_client(handler, concurrency_limit=2) as client:
+            urls = [client.BASE_URL + "deals/{}".format(i) for i in range(8)]
+            return await asyncio.wait_for(client.batch_get(urls), 5)
+
+    results = run(main())
+    assert [result["data"]["url"].rsplit("/", 1)[1] for result in results] == [str(i) for i in range(8)]
+    assert set(attempts.values()) == {2}
+
+
+def test_retries_are_bounded():
+    async def main():
+        async with make_client(lambda *args: FakeResponse(503, {"error": "down"}), max_retries=2) as client:
+            with pytest.raises(exceptions.ServiceUnavailableError):
+                await client._get(client.BASE_URL + "deals")
+            return len(client.transport.calls)
+
+    assert run(main()) == 3
+
+
+def test_non_idempotent_status_is_not_retried():
+    async def main():
+        async with make_client(lambda *args: FakeResponse(503, {"error": "down"})) as client:
+            with pytest.raises(exceptions.ServiceUnavailableError):
+                await client._post(client.BASE_URL + "deals", json={"title": "x"})
+            return len(client.transport.calls)
+
+    assert run(main()) == 1
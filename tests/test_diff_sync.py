@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+
+from pipedrive import DiffSync, exceptions
+from pipedrive.diff_sync import SnapshotStore, diff_fields
+
+
+class FakeDeals:
+    """Records update and fetch calls; ``remote`` holds the server-side state."""
+
+    def __init__(self, remote=None, fail_update=()):
+        self.remote = remote or {}
+        self.fail_update = fail_update
+        self.updates = []
+        self.fetches = []
+
+    async def update(self, record_id, data, **kwargs):
+        if record_id in self.fail_update:
+            raise exceptions.BadRequestError("invalid", None)
+        self.updates.append((record_id, data))
+        self.remote.setdefault(record_id, {}).update(data)
+        return {"success": True, "data": self.remote[record_id]}
+
+    async def fetch(self, record_id, **kwargs):
+        self.fetches.append(record_id)
+        return {"success": True, "data": dict(self.remote[record_id])}
+
+
+def test_diff_fields():
+    assert diff_fields({"a": 1, "b": 2}, {"a": 1, "b": 3}) == {"b": 2}
+    assert diff_fields({"a": 1, "c": 4}, {"a": 1}) == {"c": 4}
+    assert diff_fields({"a": 1}, None) == {"a": 1}
+
+
+def test_unchanged_records_are_skipped_and_only_changed_fields_are_sent(tmp_path):
+    path = str(tmp_path / "deals.snapshot.json")
+    store = SnapshotStore(path)
+    store.update(1, {"title": "A", "value": 10})
+    store.update(2, {"title": "B", "value": 20})
+    deals = FakeDeals()
+
+    sync = DiffSync(deals.update, snapshot=store)
+    result = asyncio.run(sync.run({1: {"title": "A", "value": 10}, 2: {"title": "B", "value": 25}}))
+
+    assert deals.updates == [(2, {"value": 25})]
+    assert (result.total, result.unchanged, result.changed, result.fields_sent) == (2, 1, 1, 1)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["2"] == {"title": "B", "value": 25}
+
+
+def test_missing_state_is_fetched_and_written_to_the_snapshot(tmp_path):
+    path = str(tmp_path / "deals.snapshot.json")
+    deals = FakeDeals(remote={1: {"id": 1, "title": "A", "value": 10, "stage_id": 3}})
+
+    sync = DiffSync(deals.update, fetch=deals.fetch, snapshot=path)
+    result = asyncio.run(sync.run([(1, {"title": "A", "value": 10})]))
+    assert deals.fetches == [1] and deals.updates == []
+    assert result.fetched == 1 and result.unchanged == 1
+
+    # Only the managed fields are remembered, and the next run needs no request
+    assert SnapshotStore(path).get(1) == {"title": "A", "value": 10}
+    result = asyncio.run(DiffSync(deals.update, fetch=deals.fetch, snapshot=path).run({1: {"title": "A", "value": 10}}))
+    assert deals.fetches == [1] and result.fetched == 0
+
+
+def test_dry_run_sends_nothing_and_does_not_save(tmp_path):
+    path = tmp_path / "deals.snapshot.json"
+    deals = FakeDeals(remote={1: {"title": "A"}})
+
+    sync = DiffSync(deals.update, fetch=deals.fetch, snapshot=str(path))
+    result = asyncio.run(sync.run({1: {"title": "B"}}, dry_run=True))
+
+    assert result.changed == 1 and result.fields_sent == 1
+    assert deals.updates == []
+    assert not path.exists()
+
+
+def test_snapshot_is_saved_when_a_run_fails(tmp_path):
+    path = str(tmp_path / "deals.snapshot.json")
+    deals = FakeDeals(fail_update={2})
+
+    async def records():
+        yield 1, {"title": "A"}
+        yield 2, {"title": "B"}
+        raise RuntimeError("source failed")
+
+    sync = DiffSync(deals.update, snapshot=path, concurrency=1)
+    with pytest.raises(RuntimeError):
+        asyncio.run(sync.run(records()))
+
+    # Record 1 was updated before the failure, record 2 was rejected and is not remembered
+    assert SnapshotStore(path).records == {"1": {"title": "A"}}
+
+
+def test_rejected_updates_are_counted():
+    deals = FakeDeals(fail_update={2})
+    result = asyncio.run(DiffSync(deals.update).run({1: {"title": "A"}, 2: {"title": "B"}}))
+    assert result.changed == 1 and result.failed == 1
+    assert isinstance(result.errors[2], exceptions.BadRequestError)
@@ -0,0 +1,84 @@
+import asyncio
+import re
+
+from pipedrive import Client, FlowHistory, FlowStore
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def entry(entry_id, day):
+    return {"object": "dealChange", "timestamp": "2024-06-{:02d} 10:00:00".format(day), "data": {"id": entry_id}}
+
+
+class FlowServer:
+    """Serves deals/{id}/flow newest first, paged by start/limit with next_start."""
+
+    def __init__(self, flows, failing=()):
+        self.flows = flows
+        self.failing = set(failing)
+        self.requests = []
+
+    def __call__(self, method, url, params, kwargs):
+        deal_id = int(re.search(r"deals/(\d+)/flow", url).group(1))
+        start, limit = int(params["start"]), int(params["limit"])
+        self.requests.append((deal_id, start))
+        if deal_id in self.failing and start > 0:
+            return FakeResponse(404, {"success": False, "error": "Deal not found"})
+
+        flow = self.flows[deal_id]
+        page = flow[start:start + limit]
+        more = start + limit < len(flow)
+        pagination = {"more_items_in_collection": more}
+        if more:
+            pagination["next_start"] = start + limit
+        return FakeResponse(200, {"success": True, "data": page, "additional_data": {"pagination": pagination}})
+
+
+def sync(store, server, deal_ids, page_size=2):
+    async def main():
+        async with Client("token", transport=FakeTransport(server)) as client:
+            return await FlowHistory(client, store, page_size=page_size).sync(deal_ids)
+
+    return asyncio.run(main())
+
+
+def test_pages_are_followed_with_next_start(tmp_path):
+    server = FlowServer({1: [entry(i, 10 - i) for i in range(5)], 2: [entry(100, 1)]})
+    with FlowStore(str(tmp_path / "flows.sqlite")) as store:
+        result = sync(store, server, [1, 2])
+        assert sorted(server.requests) == [(1, 0), (1, 2), (1, 4), (2, 0)]
+        assert (result.deals, result.pages, result.new_entries, result.failed) == (2, 4, 6, 0)
+        assert len(store.entries(1)) == 5
+
+
+def test_second_run_stops_at_first_stored_entry(tmp_path):
+    flow = [entry(i, 10 - i) for i in range(5)]
+    server = FlowServer({1: flow})
+    with FlowStore(str(tmp_path / "flows.sqlite")) as store:
+        sync(store, server, [1])
+
+        # Two new entries arrive at the top of the newest-first flow
+        flow[:0] = [entry(6, 20), entry(5, 19)]
+        server.requests = []
+        result = sync(store, server, [1])
+        assert server.requests == [(1, 0), (1, 2)]
+        assert result.new_entries == 2
+        assert len(store.entries(1)) == 7
+
+
+def test_failed_deal_stores_nothing(tmp_path):
+    server = FlowServer({1: [entry(i, 10 - i) for i in range(5)], 2: [entry(100, 1)]}, failing={1})
+    with FlowStore(str(tmp_path / "flows.sqlite")) as store:
+        result = sync(store, server, [1, 2])
+        assert result.failed == 1 and list(result.errors) == [1]
+        assert store.entries(1) == [] and store.synced_at(1) is None
+        assert len(store.entries(2)) == 1
+
+
+def test_entries_are_newest_first(tmp_path):
+    server = FlowServer({1: [entry(1, 3), entry(2, 9), entry(3, 5)]})
+    with FlowStore(str(tmp_path / "flows.sqlite")) as store:
+        sync(store, server, [1], page_size=10)
+        history = FlowHistory(Client("token"), store)
+        days = [item["timestamp"][8:10] for item in history.entries(1)]
+        assert days == ["09", "05", "03"]
+        assert history.flows([1]) == {1: history.entries(1)}
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import shutil
+import ssl
+import subprocess
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+h2_config = pytest.importorskip("h2.config")
+h2_connection = pytest.importorskip("h2.connection")
+h2_events = pytest.importorskip("h2.events")
+
+from pipedrive import Client, HttpxTransport, exceptions
+
+
+class H2Server:
+    """Minimal HTTP/2-over-TLS server that answers every GET with a small JSON page."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self.paths = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        conn = h2_connection.H2Connection(h2_config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        tasks = set()
+        try:
+            while True:
+                data = await reader.read(65535)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2_events.RequestReceived):
+                        headers = dict(event.headers)
+                        tasks.add(asyncio.ensure_future(self.respond(conn, writer, event.stream_id, headers)))
+                    elif isinstance(event, h2_events.DataReceived):
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                writer.write(conn.data_to_send())
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def respond(self, conn, writer, stream_id, headers):
+        path = headers[":path"]
+        self.paths.append(path)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+
+        if "/missing" in path:
+            status, body = 404, {"success": False, "error": "Not found"}
+        else:
+            status, body = 200, {"success": True, "data": [{"path": path.split("?")[0]}, {"n": 2}]}
+        payload = json.dumps(body).encode("utf-8")
+        conn.send_headers(stream_id, [
+            (":status", str(status)),
+            ("content-type", "application/json"),
+            ("content-length", str(len(payload))),
+        ])
+        conn.send_data(stream_id, payload, end_stream=True)
+        writer.write(conn.data_to_send())
+
+
+@pytest.fixture
+def certificate(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to create a test certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+         "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+def run_against_server(certificate, scenario, **transport_kwargs):
+    cert, key = certificate
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+    server_context.set_alpn_protocols(["h2"])
+    client_context = ssl.create_default_context(cafile=cert)
+
+    async def main():
+        h2_server = H2Server()
+        server = await asyncio.start_server(h2_server.handle, "127.0.0.1", 0, ssl=server_context)
+        port = server.sockets[0].getsockname()[1]
+        transport = HttpxTransport(verify=client_context, **transport_kwargs)
+        try:
+            async with Client("token", domain="https://127.0.0.1:{}".format(port), transport=transport,
+                              concurrency_limit=10) as client:
+                result = await asyncio.wait_for(scenario(client), 10)
+        finally:
+            server.close()
+            await server.wait_closed()
+        return h2_server, result
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_connection(certificate):
+    async def scenario(client):
+        urls = [client.BASE_URL + "deals/{}".format(i) for i in range(10)]
+        return await client.batch_get(urls)
+
+    server, results = run_against_server(certificate, scenario)
+    assert [result["data"][0]["path"] for result in results] == ["/api/v2/deals/{}".format(i) for i in range(10)]
+    assert server.connections == 1
+    assert server.max_active > 1
+
+
+def test_streamed_items_and_errors(certificate):
+    async def scenario(client):
+        items = [item async for item in client.stream_items(client.BASE_URL + "deals", params={"limit": 2})]
+        with pytest.raises(exceptions.NotFoundError):
+            await client._get(client.BASE_URL + "missing")
+        return items
+
+    server, items = run_against_server(certificate, scenario)
+    assert items == [{"path": "/api/v2/deals"}, {"n": 2}]
+    assert server.connections == 1
+    assert any("api_token=token" in path for path in server.paths)
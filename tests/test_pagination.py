@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from pipedrive import Client, exceptions
+from pipedrive import client as client_module
+from tests.fakes import FakeResponse, FakeTransport
+
+TOTAL = 250
+SERVER_PAGE_LIMIT = 100
+
+
+def capped_pages(method, url, params, kwargs):
+    """List endpoint that serves at most 100 items per page, whatever limit was asked for."""
+    start = int(params.get("start", 0))
+    limit = min(int(params.get("limit", 100)), SERVER_PAGE_LIMIT)
+    items = [{"id": i} for i in range(start, min(start + limit, TOTAL))]
+    more = start + len(items) < TOTAL
+    return FakeResponse(200, {
+        "success": True,
+        "data": items,
+        "additional_data": {"pagination": {
+            "start": start, "limit": limit, "more_items_in_collection": more, "total_count": TOTAL,
+        }},
+    })
+
+
+def collect(coro_factory):
+    async def main():
+        async with Client("token", transport=FakeTransport(capped_pages)) as client:
+            return await coro_factory(client)
+
+    return asyncio.run(main())
+
+
+async def _stream(client, **kwargs):
+    return [item async for item in client.paginate_stream(client.BASE_URL + "deals", **kwargs)]
+
+
+@pytest.fixture(params=["ijson", "no-ijson"])
+def decoder(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(client_module, "_ijson", lambda: None)
+    return request.param
+
+
+def test_paginate_follows_total_count_when_server_caps_page_size():
+    items = collect(lambda client: client.paginate(client.BASE_URL + "deals", page_size=200))
+    assert [item["id"] for item in items] == list(range(TOTAL))
+
+
+def test_paginate_stream_follows_total_count_when_server_caps_page_size(decoder):
+    items = collect(lambda client: _stream(client, page_size=200))
+    assert [item["id"] for item in items] == list(range(TOTAL))
+
+
+def test_paginate_stream_max_items(decoder):
+    items = collect(lambda client: _stream(client, page_size=100, max_items=120))
+    assert [item["id"] for item in items] == list(range(120))
+
+
+def test_paginate_stream_without_pagination_info_stops_after_first_page(decoder):
+    def handler(method, url, params, kwargs):
+        return FakeResponse(200, {"success": True, "data": [{"id": 1}, {"id": 2}]})
+
+    async def main():
+        async with Client("token", transport=FakeTransport(handler)) as client:
+            items = await _stream(client, page_size=2)
+            return items, len(client.transport.calls)
+
+    items, calls = asyncio.run(main())
+    assert items == [{"id": 1}, {"id": 2}]
+    assert calls == 1
+
+
+def test_paginate_stream_retries_network_errors(decoder):
+    failures = []
+
+    def flaky(method, url, params, kwargs):
+        if params.get("start") == 100 and not failures:
+            failures.append(params)
+            return ConnectionResetError("connection reset by peer")
+        return capped_pages(method, url, params, kwargs)
+
+    async def main():
+        async with Client("token", transport=FakeTransport(flaky)) as client:
+            client.MIN_RETRY_DELAY = 0.001
+            return await _stream(client, page_size=100)
+
+    items = asyncio.run(main())
+    assert len(failures) == 1
+    assert [item["id"] for item in items] == list(range(TOTAL))
+
+
+class BrokenStreamTransport(FakeTransport):
+    """Drops the connection after the first chunk of every body."""
+
+    async def iter_content(self, response, chunk_size=65536):
+        body = await response.read()
+        yield body[:len(body) // 2]
+        raise ConnectionResetError("connection reset by peer")
+
+
+def test_stream_items_does_not_retry_after_items_were_yielded():
+    pytest.importorskip("ijson")
+    received = []
+
+    async def main():
+        async with Client("token", transport=BrokenStreamTransport(capped_pages)) as client:
+            client.MIN_RETRY_DELAY = 0.001
+            async for item in client.stream_items(client.BASE_URL + "deals"):
+                received.append(item)
+
+    with pytest.raises(exceptions.ConnectionError):
+        asyncio.run(main())
+    # Retrying would yield the first items twice
+    assert received and [item["id"] for item in received] == list(range(len(received)))
@@ -0,0 +1,91 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from pipedrive import Client, RecordingTransport, ReplayTransport, exceptions
+from pipedrive.replay import Cassette
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def record(path, urls):
+    def handler(method, url, params, kwargs):
+        return FakeResponse(200, {"success": True, "data": {"url": url}}, {"Set-Cookie": "secret"})
+
+    async def main():
+        async with Client("secret-token", transport=RecordingTransport(FakeTransport(handler), path)) as client:
+            for url in urls:
+                await client._get(client.BASE_URL + url)
+
+    asyncio.run(main())
+
+
+def replay(path, urls, retry=True, **transport_kwargs):
+    async def main():
+        transport = ReplayTransport(path, speed=None, seed=1, **transport_kwargs)
+        results = []
+        async with Client("other-token", transport=transport) as client:
+            client.MIN_RETRY_DELAY = 0.001
+            for url in urls:
+                try:
+                    results.append(await client._get(client.BASE_URL + url, retry=retry))
+                except exceptions.BaseError as e:
+                    results.append(e)
+        return transport, results
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = str(tmp_path / "session.cassette.gz")
+    record(path, ["deals/1", "deals/2"])
+    return path
+
+
+def test_recorded_session_replays_without_credentials(cassette):
+    with gzip.open(cassette, "rt", encoding="utf-8") as f:
+        text = f.read()
+    assert "secret" not in text
+    assert len([json.loads(line) for line in text.splitlines()]) == 2
+
+    transport, results = replay(cassette, ["deals/2", "deals/1"])
+    assert [result["data"]["url"].rsplit("/", 2)[-2:] for result in results] == [["deals", "2"], ["deals", "1"]]
+    assert transport.stats["misses"] == 0
+
+
+def test_unrecorded_request_raises_miss(cassette):
+    transport, results = replay(cassette, ["deals/3"])
+    assert isinstance(results[0], exceptions.ReplayMissError)
+
+
+def test_rate_limit_below_one_request_per_second_admits_a_request(cassette):
+    transport, results = replay(cassette, ["deals/1", "deals/2"], retry=False, rate_limit=0.5)
+    assert results[0]["success"] is True
+    assert isinstance(results[1], exceptions.TooManyRequestsError)
+    assert transport.stats["rate_limited"] == 1
+
+
+def test_rate_limit_allows_a_one_second_burst(cassette):
+    transport, results = replay(cassette, ["deals/1", "deals/2", "deals/1"], retry=False, rate_limit=2)
+    assert [isinstance(result, exceptions.TooManyRequestsError) for result in results] == [False, False, True]
+
+
+def test_request_headers_and_body_are_recorded_without_credentials(tmp_path):
+    path = str(tmp_path / "session.cassette.gz")
+
+    def handler(method, url, params, kwargs):
+        return FakeResponse(201, {"success": True, "data": {"id": 1}})
+
+    async def main():
+        async with Client("secret-token", transport=RecordingTransport(FakeTransport(handler), path)) as client:
+            await client._post(client.BASE_URL + "deals", json={"title": "Deal"},
+                               headers={"Authorization": "Bearer secret", "X-Request-Id": "abc"})
+
+    asyncio.run(main())
+    (entry,) = Cassette(path).load().entries
+    assert entry["request"]["json"] == {"title": "Deal"}
+    assert entry["request"]["headers"]["X-Request-Id"] == "abc"
+    assert "Authorization" not in entry["request"]["headers"]
+    assert "secret" not in json.dumps(entry)
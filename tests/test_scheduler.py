@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from pipedrive.scheduler import PriorityScheduler, INTERACTIVE, NORMAL, BULK
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _drain(scheduler, priority, granted, label):
+    await scheduler.acquire(priority)
+    granted.append(label)
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        PriorityScheduler(0)
+    with pytest.raises(ValueError):
+        PriorityScheduler(1, {BULK: 0})
+
+
+def test_unknown_priority():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        with pytest.raises(ValueError):
+            await scheduler.acquire("urgent")
+
+    run(main())
+
+
+def test_interactive_overtakes_bulk_backlog():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire(BULK)
+
+        granted = []
+        tasks = [asyncio.ensure_future(_drain(scheduler, BULK, granted, "bulk")) for _ in range(5)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(_drain(scheduler, INTERACTIVE, granted, "interactive")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        for _ in range(len(tasks)):
+            scheduler.release(BULK if not granted else granted[-1])
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return granted
+
+    granted = run(main())
+    assert granted[:2] == ["interactive", "interactive"]
+    assert granted[2:] == ["bulk"] * 5
+
+
+def test_weighted_share_without_starvation():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire(NORMAL)
+
+        granted = []
+        tasks = [asyncio.ensure_future(_drain(scheduler, BULK, granted, BULK)) for _ in range(20)]
+        tasks += [asyncio.ensure_future(_drain(scheduler, INTERACTIVE, granted, INTERACTIVE)) for _ in range(40)]
+        await asyncio.sleep(0)
+
+        scheduler.release(NORMAL)
+        while len(granted) < len(tasks):
+            await asyncio.sleep(0)
+            scheduler.release(granted[-1])
+        await asyncio.gather(*tasks)
+        return granted
+
+    granted = run(main())
+    # 16:1 weights: one bulk request per 17 grants while both classes are backlogged
+    assert granted[:34].count(BULK) == 2
+    assert granted[:34].count(INTERACTIVE) == 32
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire(NORMAL)
+
+        waiter = asyncio.ensure_future(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+        assert scheduler.stats()[BULK]["queue_depth"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.stats()[BULK]["queue_depth"] == 0
+
+        # The cancelled entry is skipped and the slot goes to the next waiter
+        follower = asyncio.ensure_future(scheduler.acquire(NORMAL))
+        await asyncio.sleep(0)
+        scheduler.release(NORMAL)
+        await asyncio.wait_for(follower, 1)
+        return scheduler.stats()
+
+    stats = run(main())
+    assert stats[BULK]["in_flight"] == 0
+    assert stats[NORMAL]["in_flight"] == 1
+
+
+def test_waiter_cancelled_after_grant_returns_slot():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire(NORMAL)
+
+        waiter = asyncio.ensure_future(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+
+        # release() grants the slot to the waiter, which is cancelled before it resumes
+        scheduler.release(NORMAL)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The slot must be free again rather than leaked
+        await asyncio.wait_for(scheduler.acquire(INTERACTIVE), 1)
+        return scheduler.stats()
+
+    stats = run(main())
+    assert stats[BULK]["in_flight"] == 0
+    assert stats[BULK]["queue_depth"] == 0
+    assert stats[INTERACTIVE]["in_flight"] == 1
+
+
+def test_slot_reports_wait_and_releases():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        async with scheduler.slot(NORMAL) as wait:
+            assert wait == 0.0
+            assert scheduler.stats()[NORMAL]["in_flight"] == 1
+        return scheduler.stats()
+
+    stats = run(main())
+    assert stats[NORMAL]["in_flight"] == 0
+    assert stats[NORMAL]["acquired"] == 1
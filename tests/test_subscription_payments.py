@@ -0,0 +1,98 @@
+import asyncio
+import re
+
+import pytest
+
+from pipedrive import Client, SubscriptionCache, SubscriptionPaymentLoader
+from pipedrive.subscription_payments import PAYMENT_COLUMNS, PaymentTable
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def payment(payment_id, amount):
+    return {"id": payment_id, "due_at": "2024-07-01", "amount": amount, "currency": "EUR",
+            "payment_type": "recurring", "is_active": True}
+
+
+class SubscriptionServer:
+    """Serves subscriptions/find/{deal_id} and subscriptions/{id}/payments."""
+
+    def __init__(self, subscriptions, payments):
+        self.subscriptions = subscriptions
+        self.payments = payments
+        self.requests = []
+
+    def __call__(self, method, url, params, kwargs):
+        path = url.split("/api/v2/", 1)[1]
+        self.requests.append(path)
+        match = re.fullmatch(r"subscriptions/find/(\d+)", path)
+        if match:
+            subscription = self.subscriptions.get(int(match.group(1)))
+            if subscription == "missing":
+                return FakeResponse(404, {"success": False, "error": "Subscription not found"})
+            return FakeResponse(200, {"success": True, "data": subscription})
+        subscription_id = int(re.fullmatch(r"subscriptions/(\d+)/payments", path).group(1))
+        return FakeResponse(200, {"success": True, "data": self.payments[subscription_id]})
+
+
+def load(server, cache, deal_ids, max_age=None):
+    async def main():
+        async with Client("token", transport=FakeTransport(server)) as client:
+            return await SubscriptionPaymentLoader(client, cache, max_age=max_age).load(deal_ids)
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def server():
+    return SubscriptionServer(
+        subscriptions={
+            1: {"id": 10, "update_time": "2024-06-01 10:00:00"},
+            2: "missing",
+            3: None,
+        },
+        payments={10: [payment(100, 50), payment(101, 50)]},
+    )
+
+
+def test_missing_or_empty_subscription_counts_as_without_subscription(server):
+    result = load(server, SubscriptionCache(), [1, 2, 3])
+    assert (result.deals, result.without_subscription, result.fetched, result.failed) == (3, 2, 1, 0)
+    assert result.as_dict()["payments"] == 2
+
+
+def test_payments_are_refetched_only_when_update_time_changes(server):
+    with SubscriptionCache() as cache:
+        load(server, cache, [1])
+        server.requests = []
+
+        result = load(server, cache, [1])
+        assert server.requests == ["subscriptions/find/1"]
+        assert result.cached == 1 and result.fetched == 0 and len(result.payments) == 2
+
+        server.subscriptions[1] = {"id": 10, "update_time": "2024-06-02 09:00:00"}
+        server.payments[10].append(payment(102, 25))
+        server.requests = []
+        result = load(server, cache, [1])
+        assert server.requests == ["subscriptions/find/1", "subscriptions/10/payments"]
+        assert result.fetched == 1 and len(result.payments) == 3
+
+
+def test_max_age_hit_makes_no_request(server):
+    with SubscriptionCache() as cache:
+        load(server, cache, [1, 2])
+        server.requests = []
+        result = load(server, cache, [1, 2], max_age=3600)
+        assert server.requests == []
+        assert (result.cached, result.without_subscription, len(result.payments)) == (1, 1, 2)
+
+
+def test_payment_table_columns():
+    table = PaymentTable()
+    table.extend(1, 10, [payment(100, 50), {"id": 101}])
+    assert tuple(table.columns) == PAYMENT_COLUMNS
+    assert table.columns["deal_id"] == [1, 1]
+    assert table.columns["subscription_id"] == [10, 10]
+    assert table.columns["amount"] == [50, None]
+    assert len(table) == 2
+    assert next(table.rows()) == dict(deal_id=1, subscription_id=10, payment_id=100, due_at="2024-07-01",
+                                      amount=50, currency="EUR", payment_type="recurring", is_active=True)
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from pipedrive import Client, Tracer
+from pipedrive import client as client_module
+from pipedrive.tracing import endpoint_template
+from tests.fakes import FakeResponse, FakeTransport
+
+
+def pages(method, url, params, kwargs):
+    start = int(params.get("start", 0))
+    items = [{"id": i} for i in range(start, min(start + 2, 5))]
+    return FakeResponse(200, {"data": items, "additional_data": {"pagination": {"total_count": 5}}})
+
+
+def traced(handler, scenario):
+    tracer = Tracer()
+
+    async def main():
+        async with Client("token", transport=FakeTransport(handler), tracer=tracer) as client:
+            client.MIN_RETRY_DELAY = 0.001
+            return await scenario(client, tracer)
+
+    return tracer.exporter, asyncio.run(main())
+
+
+@pytest.fixture(params=["ijson", "no-ijson"])
+def decoder(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(client_module, "_ijson", lambda: None)
+    return request.param
+
+
+def test_endpoint_template_strips_ids_and_query():
+    url = "https://api.pipedrive.com/api/v2/deals/42/flow?api_token=secret"
+    assert endpoint_template(url, "https://api.pipedrive.com/api/v2/") == "deals/{id}/flow"
+
+
+def test_request_span_records_retries_without_printing(capsys):
+    attempts = []
+
+    def handler(method, url, params, kwargs):
+        attempts.append(url)
+        if len(attempts) == 1:
+            return FakeResponse(429, {"error": "Request over limit"})
+        # Chunked or compressed responses carry no Content-Length
+        return FakeResponse(200, {"data": {"id": 7}})
+
+    exporter, _ = traced(handler, lambda client, tracer: client._get(client.BASE_URL + "deals/7"))
+    assert capsys.readouterr().out == ""
+
+    first, retried = sorted(exporter.find("GET deals/{id}"), key=lambda span: span.attributes["pipedrive.retry_count"])
+    assert first.attributes["http.status_code"] == 429
+    assert [event["name"] for event in first.events] == ["retry"]
+    assert retried.parent_id == first.span_id
+    assert retried.attributes["http.status_code"] == 200
+    assert retried.attributes["http.response_content_length"] == len(b'{"data": {"id": 7}}')
+    assert "token" not in repr(exporter.spans)
+
+
+def test_stream_items_is_traced(decoder):
+    async def scenario(client, tracer):
+        with tracer.span("report") as report:
+            items = [item async for item in client.stream_items(client.BASE_URL + "deals")]
+        return report, items
+
+    exporter, (report, items) = traced(pages, scenario)
+    assert len(items) == 2
+    (span,) = exporter.find("GET deals")
+    assert span.parent_id == report.span_id
+    assert span.attributes["http.status_code"] == 200
+    assert span.attributes["http.response_content_length"] == len(asyncio.run(pages("GET", "", {}, {}).read()))
+
+
+def test_paginate_stream_pages_share_a_parent_span(decoder):
+    async def scenario(client, tracer):
+        with tracer.span("report") as report:
+            items = [item async for item in client.paginate_stream(client.BASE_URL + "deals", page_size=2)]
+            # The generator must not leave its spans current in the caller's context
+            assert tracer.current_span() is report
+        return report, items
+
+    exporter, (report, items) = traced(pages, scenario)
+    assert [item["id"] for item in items] == list(range(5))
+
+    (parent,) = exporter.find("paginate_stream")
+    assert parent.parent_id == report.span_id
+    assert parent.attributes["pipedrive.items"] == 5
+
+    page_spans = exporter.find("GET deals")
+    assert len(page_spans) == 3
+    assert {span.parent_id for span in page_spans} == {parent.span_id}
+    assert {span.trace_id for span in page_spans} == {report.trace_id}
+
+
+def test_stream_items_failure_is_recorded():
+    def handler(method, url, params, kwargs):
+        return FakeResponse(404, {"success": False, "error": "Not found"})
+
+    async def scenario(client, tracer):
+        with pytest.raises(Exception):
+            [item async for item in client.stream_items(client.BASE_URL + "deals")]
+
+    pytest.importorskip("ijson")
+    exporter, _ = traced(handler, scenario)
+    (span,) = exporter.find("GET deals")
+    assert span.status == "ERROR"
+    assert span.attributes["http.status_code"] == 404
+
+
+def test_batch_get_stream_requests_are_children_of_the_batch_span():
+    async def scenario(client, tracer):
+        urls = [client.BASE_URL + "deals/{}".format(i) for i in range(3)]
+        return [pair async for pair in client.batch_get_stream(urls)]
+
+    exporter, _ = traced(pages, scenario)
+    (batch,) = exporter.find("batch_get_stream")
+    assert batch.attributes["pipedrive.batch_size"] == 3
+    assert {span.parent_id for span in exporter.find("GET deals/{id}")} == {batch.span_id}